@@ -0,0 +1,58 @@
+"""Benchmark the throughput of parsing (and validating) single ``.win`` files.
+
+Run with ``python benchmarks/parse.py [--files N]``. The rate of ``parse_lines`` is that of the
+tokenizer and the conversion of the values alone; ``from_str`` and ``from_file`` also validate
+the model, and ``from_file`` reads each file from disk.
+"""
+
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+
+from wannier90_input.models.latest import Wannier90Input
+from wannier90_input.parse import parse_lines
+
+example = Path(__file__).parents[1] / "tests" / "data" / "example.win"
+
+
+def _rate(function: Callable[[Any], Any], items: list[Any], repeat: int) -> float:
+    """Return the best rate (items per second) of ``repeat`` passes over ``items``."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            function(item)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best
+
+
+@click.command()
+@click.option("--files", default=5_000, help="Number of .win files to parse.")
+@click.option("--repeat", default=5, help="Number of passes, of which the fastest is reported.")
+def main(files: int, repeat: int) -> None:
+    """Report the number of files parsed per second by each stage of the parser."""
+    content = example.read_text()
+    contents = [content.replace("num_wann  =  8", f"num_wann = {8 + i % 4}") for i in range(files)]
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i, text in enumerate(contents):
+            path = Path(directory) / f"{i}.win"
+            path.write_text(text)
+            paths.append(path)
+
+        stages: dict[str, tuple[Callable[[Any], Any], list[Any]]] = {
+            "parse_lines": (lambda text: parse_lines(text.splitlines(), Wannier90Input), contents),
+            "from_str": (Wannier90Input.from_str, contents),
+            "from_file": (Wannier90Input.from_file, paths),
+        }
+        click.echo(f"{'stage':>12} {'files/s':>10}")
+        for name, (function, items) in stages.items():
+            click.echo(f"{name:>12} {_rate(function, items, repeat):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Benchmark the scaling of :func:`wannier90_input.bulk.parse_many` with the number of workers.
+
+Run with ``python benchmarks/parse_many.py [--files N]``; the speed-up relative to a single
+process should be close to the number of workers, up to the number of physical cores.
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+from wannier90_input.bulk import parse_many
+
+example = Path(__file__).parents[1] / "tests" / "data" / "example.win"
+
+
+@click.command()
+@click.option("--files", default=20_000, help="Number of .win files to parse.")
+@click.option("--max-workers", default=os.cpu_count() or 1, help="Largest pool to benchmark.")
+def main(files: int, max_workers: int) -> None:
+    """Time parse_many for pools of 1, 2, 4, ... workers."""
+    content = example.read_text()
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(files):
+            path = Path(directory) / f"{i}.win"
+            path.write_text(content.replace("num_wann  =  8", f"num_wann = {8 + i % 4}"))
+            paths.append(path)
+
+        workers, reference = 1, None
+        click.echo(f"{'workers':>8} {'time (s)':>10} {'files/s':>10} {'speed-up':>9}")
+        while workers <= max_workers:
+            start = time.perf_counter()
+            results = parse_many(paths, workers=workers, keep_models=False)
+            elapsed = time.perf_counter() - start
+            assert all(result.error is None for result in results)  # noqa: S101
+            reference = reference or elapsed
+            rate, speed_up = files / elapsed, reference / elapsed
+            click.echo(f"{workers:>8} {elapsed:>10.2f} {rate:>10.0f} {speed_up:>9.1f}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
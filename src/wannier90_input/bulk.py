@@ -0,0 +1,105 @@
+"""Functions for parsing and validating many ``.win`` files at once."""
+
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, NamedTuple
+
+from tqdm import tqdm
+
+from wannier90_input.models.latest import Wannier90Input
+from wannier90_input.models.template import Wannier90InputTemplate
+
+PathLike = str | os.PathLike[str]
+
+
+class ParseResult(NamedTuple):
+    """The outcome of parsing one ``.win`` file: either a model or an error message."""
+
+    path: str
+    model: Wannier90InputTemplate | None
+    error: str | None
+
+
+def parse_many(
+    paths: Sequence[PathLike],
+    workers: int | None = None,
+    chunksize: int | None = None,
+    model: type[Wannier90InputTemplate] = Wannier90Input,
+    keep_models: bool = True,
+    progress: bool = False,
+) -> list[ParseResult]:
+    """Parse and validate many ``.win`` files, spreading the work over a pool of processes.
+
+    The results are returned in the same order as ``paths``. A file that cannot be read or
+    validated does not interrupt the others; its error is recorded in its :class:`ParseResult`.
+
+    :param workers: the number of processes (defaults to the number of CPUs); with ``workers=1``
+        the files are parsed in this process
+    :param chunksize: the number of files sent to a process at once (by default, each process
+        receives about four chunks)
+    :param keep_models: return the validated models; sending them back from the worker processes
+        is a serial cost in this process, so pass ``False`` when only the errors are of interest
+        (e.g. when checking an archive) to keep the scaling close to linear
+    :param progress: show a progress bar
+    """
+    workers = workers or os.cpu_count() or 1
+    parse = partial(_parse_one, model, keep_models)
+    with tqdm(total=len(paths), disable=not progress, unit="file") as bar:
+        if workers == 1:
+            results = []
+            for path in paths:
+                results.append(parse(path))
+                bar.update()
+            return results
+
+        chunksize = chunksize or max(1, len(paths) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = []
+            for result in executor.map(parse, paths, chunksize=chunksize):
+                results.append(result)
+                bar.update()
+            return results
+
+
+class TrustedConstructor:
+    """Construct models from trusted values, fully validating one in every ``validate_every``.
+
+    Most models are constructed with :meth:`~.Wannier90InputTemplate.from_trusted`, without
+    validation. The first model, and every ``validate_every``-th one after it, are validated as
+    usual, so that a systematic problem with the values still raises a ``ValidationError``.
+
+    >>> construct = TrustedConstructor(Wannier90Input, validate_every=100)  # doctest: +SKIP
+    >>> models = [construct(**values) for values in rows]  # doctest: +SKIP
+    """
+
+    def __init__(
+        self, model: type[Wannier90InputTemplate] = Wannier90Input, validate_every: int = 0
+    ):
+        """Create a constructor; with ``validate_every=0``, no model is validated."""
+        if validate_every < 0:
+            raise ValueError("validate_every must not be negative")
+        self.model = model
+        self.validate_every = validate_every
+        self.constructed = 0
+        self.validated = 0
+
+    def __call__(self, **values: Any) -> Wannier90InputTemplate:
+        """Construct a model from ``values``, validating it if it is its turn."""
+        sample = self.validate_every and self.constructed % self.validate_every == 0
+        self.constructed += 1
+        if sample:
+            self.validated += 1
+            return self.model.model_validate(values)
+        return self.model.from_trusted(**values)
+
+
+def _parse_one(
+    model: type[Wannier90InputTemplate], keep_model: bool, path: PathLike
+) -> ParseResult:
+    try:
+        parsed = model.from_file(path)
+        return ParseResult(str(path), parsed if keep_model else None, None)
+    except Exception as e:  # noqa: BLE001 (one bad file must not stop the others)
+        return ParseResult(str(path), None, f"{type(e).__name__}: {e}")
@@ -0,0 +1,126 @@
+"""A cache of parsed ``.win`` files, for workflows that read the same inputs repeatedly."""
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Literal, NamedTuple
+
+from wannier90_input.models.latest import Wannier90Input
+from wannier90_input.models.template import Wannier90InputTemplate
+
+PathLike = str | os.PathLike[str]
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a :class:`ParsedInputCache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+    max_size: int
+
+
+class ParsedInputCache:
+    """A least-recently-used cache of the models parsed from ``.win`` files.
+
+    Entries are keyed by the resolved path of the file and are invalidated when its identity
+    changes: with ``identity="stat"`` that is its size and modification time; with
+    ``identity="hash"`` it is a hash of its content, which also survives e.g. copying an
+    unmodified file.
+
+    The models are stored pickled, and each call to :meth:`get` unpickles a new copy (which is
+    still several times faster than parsing the file), so the models it returns can be modified
+    freely. The memory used by the cache is bounded via the total size of the pickled models,
+    which is what it holds, evicting the least recently used entries beyond ``max_size`` bytes.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 64 * 2**20,
+        model: type[Wannier90InputTemplate] = Wannier90Input,
+        identity: Literal["stat", "hash"] = "stat",
+    ):
+        """Create an empty cache."""
+        self.max_size = max_size
+        self.model = model
+        self.identity = identity
+        self._entries: OrderedDict[str, tuple[Any, int, bytes]] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path: PathLike) -> Wannier90InputTemplate:
+        """Return the model for the ``.win`` file at ``path``, parsing it if necessary."""
+        key = str(Path(path).resolve())
+        identity = self._identify(key)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == identity:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return pickle.loads(entry[2])  # type: ignore[no-any-return]  # noqa: S301
+
+        self.misses += 1
+        parsed = self.model.from_file(key)
+        data = pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remove(key)
+        self._entries[key] = (identity, len(data), data)
+        self._size += len(data)
+        self._evict()
+        return parsed
+
+    def _identify(self, path: str) -> Any:
+        if self.identity == "hash":
+            return hashlib.blake2b(Path(path).read_bytes(), digest_size=16).digest()
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+    def _evict(self) -> None:
+        while self._size > self.max_size and len(self._entries) > 1:
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+
+    def cache_info(self) -> CacheInfo:
+        """Return the hit/miss statistics and the current size of the cache."""
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, len(self._entries), self._size, self.max_size
+        )
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        self._entries.clear()
+        self._size = self.hits = self.misses = self.evictions = 0
+
+    def save(self, path: PathLike) -> None:
+        """Save the entries of the cache to disk, so that other processes can :meth:`load` them."""
+        with open(path, "wb") as f:
+            pickle.dump((self.model, self.identity, list(self._entries.items())), f)
+
+    def load(self, path: PathLike) -> None:
+        """Add the entries saved in the cache file at ``path`` by :meth:`save`.
+
+        Cache files are pickles: only load files written by a source you trust. Entries for files
+        that have changed since the cache was saved are discarded the first time they are looked up.
+        """
+        with open(path, "rb") as f:
+            model, identity, entries = pickle.load(f)  # noqa: S301
+        if model is not self.model or identity != self.identity:
+            raise ValueError(
+                f"`{path}` caches {model.__module__}.{model.__name__} inputs identified by "
+                f"`{identity}`, which is incompatible with this cache"
+            )
+        for key, entry in entries:
+            self._remove(key)
+            self._entries[key] = entry
+            self._size += entry[1]
+        self._evict()
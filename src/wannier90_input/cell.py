@@ -0,0 +1,44 @@
+"""Vectorised conversions between cartesian and fractional coordinates, and between units.
+
+Positions are (N, 3) arrays, whose rows are converted at once; the unit cell is a (3, 3) array
+whose rows are the lattice vectors, as in ``unit_cell_cart``.
+"""
+
+from typing import Any, Literal
+
+import numpy as np
+
+from wannier90_input.parse import BOHR_TO_ANG
+
+LengthUnit = Literal["ang", "bohr"]
+
+
+def cartesian_to_fractional(cell: Any, positions: Any, wrap: bool = False) -> np.ndarray:
+    """Convert cartesian positions to fractional coordinates, with one solve against ``cell``.
+
+    :param wrap: whether to wrap the coordinates into [0, 1), i.e. the positions into the cell
+    """
+    cell = np.asarray(cell, dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    # (adding 0 turns any -0.0, which would be written as such, into 0.0)
+    fractional = np.linalg.solve(cell.T, positions.T).T + 0.0
+    if wrap:
+        fractional %= 1.0
+    return fractional
+
+
+def fractional_to_cartesian(cell: Any, positions: Any) -> np.ndarray:
+    """Convert fractional coordinates to cartesian positions, in the units of ``cell``."""
+    fractional = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    cartesian: np.ndarray = fractional @ np.asarray(cell, dtype=np.float64) + 0.0
+    return cartesian
+
+
+def to_angstrom(values: Any, units: LengthUnit) -> np.ndarray:
+    """Convert an array of lengths (e.g. a unit cell, or cartesian positions) to Å."""
+    lengths = np.asarray(values, dtype=np.float64)
+    if units == "bohr":
+        return lengths * BOHR_TO_ANG
+    if units == "ang":
+        return lengths
+    raise ValueError(f"Unknown length unit `{units}`")
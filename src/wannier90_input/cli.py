@@ -14,6 +14,7 @@ later, but that will cause problems--the code will get executed twice:
 """
 
 import json
+from pathlib import Path
 
 import click
 
@@ -62,5 +63,40 @@ def schema() -> None:
     print(json.dumps(Wannier90Input.model_json_schema(), indent=2))  # noqa: T201
 
 
+@main.command()
+@click.argument("directory", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("-k", "--keyword", "keywords", multiple=True, help="A keyword to index.")
+@click.option(
+    "-w",
+    "--where",
+    "conditions",
+    multiple=True,
+    help="Only list files that satisfy this condition, e.g. 'num_wann>50'.",
+)
+@click.option(
+    "--index",
+    "index_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Where to store the index (defaults to DIRECTORY/.winindex.sqlite).",
+)
+def index(
+    directory: Path, keywords: tuple[str, ...], conditions: tuple[str, ...], index_path: Path | None
+) -> None:
+    """Index the keywords of the .win files in DIRECTORY and list those that match."""
+    from wannier90_input.index import index_directory, parse_condition
+
+    parsed = [parse_condition(condition) for condition in conditions]
+    win_index = index_directory(
+        directory, [*keywords, *(keyword for keyword, _, _ in parsed)], index_path
+    )
+    try:
+        for path, error in win_index.errors.items():
+            click.echo(f"Skipping {path}: {error}", err=True)
+        for path in win_index.query(parsed):
+            click.echo(path)
+    finally:
+        win_index.close()
+
+
 if __name__ == "__main__":
     main()
@@ -24,6 +24,7 @@ def convert_xml_tree_to_model(root: Element, version: str = "latest") -> str:
     class_definitions = {}
 
     fields = set()
+    postw90_keywords = set()
     for parameter in root.findall("parameter"):
         name = _get_name(parameter)
         if name in fields_to_exclude:
@@ -36,6 +37,7 @@ def convert_xml_tree_to_model(root: Element, version: str = "latest") -> str:
 
         # For the moment, only implementing Wannier90 and not post-processing
         if parameter.attrib["tool"] != "w90":
+            postw90_keywords.add(name)
             continue
 
         field_def = _parse_parameter(parameter)
@@ -49,7 +51,9 @@ def convert_xml_tree_to_model(root: Element, version: str = "latest") -> str:
 
     class_definitions.update(**fields_to_patch)
 
-    return _generate_model_string(class_definitions, version=version)
+    return _generate_model_string(
+        class_definitions, sorted(postw90_keywords - set(class_definitions)), version=version
+    )
 
 
 def _get_name(parameter: Element) -> str:
@@ -133,8 +137,15 @@ def _get_default_str(
     return default_str
 
 
-def _generate_model_string(class_definitions: dict[str, str], version: str) -> str:
-    """Convert a dictionary of class definitions to raw python code defining a Pydantic model."""
+def _generate_model_string(
+    class_definitions: dict[str, str], postw90_keywords: list[str], version: str
+) -> str:
+    """Convert a dictionary of class definitions to raw python code defining a Pydantic model.
+
+    The model also carries a table that maps the lower-cased spelling of every keyword (including
+    those that are only read by `postw90`) to its canonical name, for case-insensitive parsing.
+    """
+    keyword_table = {name.lower(): name for name in [*class_definitions, *postw90_keywords]}
     return (
         '"""'
         + f"""Pydantic model for the input of `Wannier90` version `{version}`.
@@ -147,7 +158,7 @@ This file has been generated automatically. Do not edit it manually.
 # ruff: noqa
 
 from pydantic import Field
-from typing import Annotated, Literal
+from typing import Annotated, ClassVar, Literal
 from wannier90_input.models.template import Wannier90InputTemplate
 {import_parameter_models}
 
@@ -156,7 +167,10 @@ class Wannier90Input(Wannier90InputTemplate):
         + '"""'
         + "Pydantic model for the input of `Wannier90.`"
         + '"""'
-        + """
+        + f"""
+
+    keyword_table: ClassVar[dict[str, str]] = {keyword_table!r}
+    postw90_keywords: ClassVar[frozenset[str]] = frozenset({postw90_keywords!r})
 
 """
         + "\n".join([f"    {k}: {v}" for k, v in class_definitions.items()])
@@ -0,0 +1,234 @@
+"""An on-disk index of the keywords of many ``.win`` files, for fast repeated queries.
+
+Files are scanned with :func:`wannier90_input.parse.peek`, which never tokenizes the rows of
+``begin ... end`` blocks and stops reading a file once the requested keywords have been found.
+The results are stored in a SQLite database, and files are only re-scanned when their size or
+modification time changes.
+"""
+
+import operator
+import os
+import re
+import sqlite3
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from wannier90_input.models import keywords as known_keywords
+from wannier90_input.models.latest import Wannier90Input
+from wannier90_input.parse import InvalidWinSyntaxError, block_keywords, parse_value, peek
+
+operators: dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_condition = re.compile(r"\s*(\w+)\s*(==|!=|<=|>=|=|<|>)\s*(.+?)\s*$")
+_canonical_keywords = {keyword.lower(): keyword for keyword in known_keywords}
+
+_schema = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, scanned TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS keywords (
+    path TEXT, keyword TEXT, value, PRIMARY KEY (keyword, path)
+) WITHOUT ROWID;
+"""
+
+Condition = tuple[str, str, Any]
+
+
+class WinIndex:
+    """An on-disk index of the scalar keywords of a collection of ``.win`` files."""
+
+    def __init__(self, path: str | os.PathLike[str]):
+        """Open (or create) the index stored at ``path``."""
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_schema)
+        # The files that could not be scanned (since the index was opened), with the reasons why
+        self.errors: dict[str, str] = {}
+
+    def update(self, paths: Iterable[str | os.PathLike[str]], keywords: Iterable[str]) -> int:
+        """Scan any new or modified files in ``paths`` for ``keywords``, returning how many.
+
+        Keywords that were indexed for a file previously remain indexed when it is re-scanned.
+        The files of ``paths`` that no longer exist, or that cannot be read, are removed from the
+        index; the reasons why the latter could not be read are kept in :attr:`errors`.
+        """
+        wanted = {canonical_keyword(keyword) for keyword in keywords}
+        scanned = 0
+        with self.connection:
+            for path in paths:
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    self._remove([path])
+                    continue
+                previous, unchanged = self._indexed_keywords(path, stat)
+                if unchanged and wanted <= previous:
+                    continue
+                self.errors.pop(str(path), None)
+                try:
+                    self._scan(path, stat, sorted(wanted | previous))
+                except (OSError, InvalidWinSyntaxError) as err:
+                    self.errors[str(path)] = str(err)
+                    self._remove([path])
+                    continue
+                scanned += 1
+        return scanned
+
+    def _indexed_keywords(
+        self, path: str | os.PathLike[str], stat: os.stat_result
+    ) -> tuple[set[str], bool]:
+        """Return the keywords indexed for ``path``, and whether it is unchanged since."""
+        row = self.connection.execute(
+            "SELECT size, mtime_ns, scanned FROM files WHERE path = ?", (str(path),)
+        ).fetchone()
+        if row is None:
+            return set(), False
+        keywords = set(row[2].split(",")) if row[2] else set()
+        return keywords, (row[0], row[1]) == (stat.st_size, stat.st_mtime_ns)
+
+    def _scan(
+        self, path: str | os.PathLike[str], stat: os.stat_result, keywords: list[str]
+    ) -> None:
+        values = peek(path, keywords)
+        self.connection.execute("DELETE FROM keywords WHERE path = ?", (str(path),))
+        self.connection.executemany(
+            "INSERT INTO keywords VALUES (?, ?, ?)",
+            [
+                (str(path), _canonical_keywords[key], _to_sql(_canonical_keywords[key], value))
+                for key, value in values.items()
+            ],
+        )
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+            (str(path), stat.st_size, stat.st_mtime_ns, ",".join(keywords)),
+        )
+
+    def prune(self, directory: str | os.PathLike[str], paths: Iterable[Path]) -> None:
+        """Remove the indexed files within ``directory`` that are not among ``paths``.
+
+        E.g. the files that were deleted since ``directory`` was last indexed; no file is read.
+        """
+        existing = {str(path) for path in paths}
+        with self.connection:
+            self._remove(
+                path
+                for (path,) in self.connection.execute("SELECT path FROM files").fetchall()
+                if path not in existing and Path(path).is_relative_to(directory)
+            )
+
+    def _remove(self, paths: Iterable[str | os.PathLike[str]]) -> None:
+        deleted = [(str(path),) for path in paths]
+        self.connection.executemany("DELETE FROM files WHERE path = ?", deleted)
+        self.connection.executemany("DELETE FROM keywords WHERE path = ?", deleted)
+
+    def values(self, path: str | os.PathLike[str]) -> dict[str, Any]:
+        """Return the indexed keywords of the file at ``path`` (with booleans stored as 0/1)."""
+        rows = self.connection.execute(
+            "SELECT keyword, value FROM keywords WHERE path = ?", (str(path),)
+        )
+        return dict(rows.fetchall())
+
+    def query(self, conditions: Iterable[Condition]) -> list[str]:
+        """Return the paths of the indexed files that satisfy all of the given conditions.
+
+        Each condition is a ``(keyword, operator, value)`` tuple, such as ``("num_wann", ">", 50)``
+        (see :func:`parse_condition`). A file that does not specify a keyword is compared
+        against that keyword's default value. The files for which a keyword has not been indexed
+        yet are scanned for it first (see :meth:`update`).
+        """
+        conditions = [(canonical_keyword(keyword), op, value) for keyword, op, value in conditions]
+        keywords = {keyword for keyword, _, _ in conditions}
+        unscanned = [
+            path
+            for path, scanned in self.connection.execute("SELECT path, scanned FROM files")
+            if not keywords <= set(scanned.split(","))
+        ]
+        if unscanned:
+            self.update(unscanned, keywords)
+
+        paths = {row[0] for row in self.connection.execute("SELECT path FROM files")}
+        for keyword, op, value in conditions:
+            compare = operators[op]
+            default = _default(keyword)
+            specified = dict(
+                self.connection.execute(
+                    "SELECT path, value FROM keywords WHERE keyword = ?", (keyword,)
+                ).fetchall()
+            )
+            paths = {
+                path
+                for path in paths
+                if _compare(compare, specified.get(path, default), _to_sql(keyword, value))
+            }
+        return sorted(paths)
+
+    def close(self) -> None:
+        """Close the index."""
+        self.connection.close()
+
+
+def canonical_keyword(keyword: str) -> str:
+    """Return the canonical spelling of a scalar Wannier90 keyword."""
+    canonical = _canonical_keywords.get(keyword.lower())
+    if canonical is None:
+        raise ValueError(f"`{keyword}` is not a Wannier90 keyword")
+    if canonical in block_keywords:
+        raise ValueError(f"`{keyword}` is a block, not a scalar keyword")
+    return canonical
+
+
+def parse_condition(condition: str) -> Condition:
+    """Parse a condition such as ``"num_wann > 50"`` or ``"dis_froz_proj = true"``."""
+    match = _condition.match(condition)
+    if match is None:
+        raise ValueError(f"Invalid condition `{condition}`")
+    keyword, op, value = match.groups()
+    return canonical_keyword(keyword), op, value
+
+
+def index_directory(
+    directory: str | os.PathLike[str],
+    keywords: Iterable[str],
+    index_path: str | os.PathLike[str] | None = None,
+) -> WinIndex:
+    """Index all of the ``.win`` files in ``directory`` (recursively), forgetting deleted ones."""
+    directory = Path(directory)
+    index = WinIndex(directory / ".winindex.sqlite" if index_path is None else index_path)
+    paths = sorted(directory.rglob("*.win"))
+    index.prune(directory, paths)
+    index.update(paths, keywords)
+    return index
+
+
+def _to_sql(keyword: str, value: Any) -> Any:
+    """Convert a raw value to one that can be stored in (and compared within) the index."""
+    if isinstance(value, str):
+        try:
+            value = parse_value(Wannier90Input, keyword, value)
+        except ValueError:
+            return value
+    if isinstance(value, bool | int | float | str) or value is None:
+        return value
+    return " ".join(str(x) for x in value)
+
+
+def _default(keyword: str) -> Any:
+    field = Wannier90Input.model_fields.get(keyword)
+    if field is None or field.is_required() or field.default_factory is not None:
+        return None
+    return _to_sql(keyword, field.default)
+
+
+def _compare(compare: Callable[[Any, Any], bool], left: Any, right: Any) -> bool:
+    try:
+        return left is not None and compare(left, right)
+    except TypeError:
+        return False
@@ -0,0 +1,206 @@
+"""Functions for generating the k-point meshes of `Wannier90` inputs, and their b-vectors.
+
+The b-vectors connect each k-point of a mesh to its neighbours in the finite-difference formula
+for the gradient in k-space. As in Wannier90, they are grouped in shells of equal length, and
+the shells are chosen (and weighted) so that they satisfy the "B1" condition of Marzari and
+Vanderbilt, PRB 56, 12847 (1997)::
+
+    sum_b w_b b_i b_j = delta_ij
+
+This lets the choice of ``shell_list``, ``search_shells`` and ``kmesh_tol`` be checked (and the
+``nnkpts`` block be generated) before Wannier90 is run.
+"""
+
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+import numpy as np
+
+
+@lru_cache(maxsize=8)
+def monkhorst_pack(mp_grid: tuple[int, int, int]) -> np.ndarray:
+    """Return the (unshifted) Monkhorst-Pack mesh of ``mp_grid`` as an (N, 3) array.
+
+    The k-points are in fractional coordinates within [0, 1), and in the order of Wannier90's
+    ``kmesh.pl`` (the last coordinate varying fastest). The meshes of the most recently used grids
+    are cached, so the array is read-only.
+    """
+    axes = [np.arange(n) / n for n in mp_grid]
+    mesh = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+    mesh.flags.writeable = False
+    return mesh
+
+
+class BvectorShells(NamedTuple):
+    """The shells of b-vectors chosen for a k-point mesh, as found by :func:`bvector_shells`."""
+
+    #: The indices (from 1, as in ``shell_list``) of the chosen shells, nearest first
+    shells: tuple[int, ...]
+    #: The b-vectors of the chosen shells in cartesian coordinates (1/Å), as an (M, 3) array
+    vectors: np.ndarray
+    #: The b-vectors as (M, 3) integer steps between the points of the mesh
+    steps: np.ndarray
+    #: The weight of each b-vector in the finite-difference formula
+    weights: np.ndarray
+    #: Whether the shells satisfy the B1 condition
+    b1_satisfied: bool
+
+
+def bvector_shells(
+    cell: Any,
+    mp_grid: Any,
+    kmesh_tol: float = 1e-6,
+    search_shells: int = 36,
+    shell_list: Any = (),
+) -> BvectorShells:
+    """Find the shells of b-vectors of the mesh ``mp_grid`` of the unit cell ``cell`` (in Å).
+
+    As in Wannier90, the ``search_shells`` nearest shells are searched (in order) for shells
+    that are not parallel to the ones already chosen, and whose inclusion keeps the weights
+    well-defined, until the chosen shells satisfy B1. If ``shell_list`` is given, exactly those
+    shells are chosen instead. The result is cached per set of arguments, so its arrays are
+    read-only.
+
+    :param kmesh_tol: the tolerance within which b-vectors are of the same length, and B1 is
+        satisfied
+    """
+    return _bvector_shells(
+        tuple(map(tuple, np.asarray(cell, dtype=np.float64).tolist())),
+        tuple(int(n) for n in mp_grid),
+        float(kmesh_tol),
+        int(search_shells),
+        tuple(int(s) for s in shell_list),
+    )
+
+
+@lru_cache(maxsize=64)
+def _bvector_shells(
+    cell: tuple[tuple[float, ...], ...],
+    mp_grid: tuple[int, ...],
+    kmesh_tol: float,
+    search_shells: int,
+    shell_list: tuple[int, ...],
+) -> BvectorShells:
+    steps, vectors, lengths = _nearest_vectors(
+        np.array(cell), np.array(mp_grid), max(search_shells, *shell_list, 1), kmesh_tol
+    )
+    shell_of = np.concatenate([[0], np.cumsum(np.diff(lengths) > kmesh_tol)])
+    target = np.array([1.0, 1.0, 1.0, 0.0, 0.0, 0.0])
+
+    def moments(shell: int) -> np.ndarray:
+        # The sums over the shell of b_x b_x, b_y b_y, b_z b_z, b_x b_y, b_y b_z and b_z b_x
+        b = vectors[shell_of == shell]
+        sums: np.ndarray = np.einsum("mi,mi->i", b[:, [0, 1, 2, 0, 1, 2]], b[:, [0, 1, 2, 1, 2, 0]])
+        return sums
+
+    if shell_list:
+        chosen = [s - 1 for s in shell_list]
+        matrix = np.stack([moments(s) for s in chosen], axis=1)
+    else:
+        chosen = []
+        matrix = np.zeros((6, 0))
+        for shell in range(search_shells):
+            b = vectors[shell_of == shell]
+            previous = vectors[np.isin(shell_of, chosen)]
+            cosines = np.abs(b @ previous.T) / np.outer(
+                np.linalg.norm(b, axis=1), np.linalg.norm(previous, axis=1)
+            )
+            if np.any(np.abs(cosines - 1) < 1e-6):
+                continue
+            candidate = np.column_stack([matrix, moments(shell)])
+            if np.linalg.svd(candidate, compute_uv=False).min() < 1e-5:
+                continue
+            chosen.append(shell)
+            matrix = candidate
+            shell_weights = np.linalg.lstsq(matrix, target, rcond=None)[0]
+            if np.allclose(matrix @ shell_weights, target, rtol=0, atol=kmesh_tol):
+                break
+
+    shell_weights = np.linalg.lstsq(matrix, target, rcond=None)[0]
+    satisfied = bool(np.allclose(matrix @ shell_weights, target, rtol=0, atol=kmesh_tol))
+    selected = np.isin(shell_of, chosen)
+    weight_of_shell = np.zeros(shell_of[-1] + 1)
+    weight_of_shell[chosen] = shell_weights
+    shells = BvectorShells(
+        tuple(s + 1 for s in chosen),
+        vectors[selected],
+        steps[selected],
+        weight_of_shell[shell_of[selected]],
+        satisfied,
+    )
+    for array in shells[1:4]:
+        array.flags.writeable = False
+    return shells
+
+
+def _nearest_vectors(
+    cell: np.ndarray, mp_grid: np.ndarray, num_shells: int, kmesh_tol: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the (nonzero) vectors between the points of the mesh in the nearest shells.
+
+    The vectors are returned as integer steps along the mesh, in cartesian coordinates and as
+    their lengths, sorted by length.
+    """
+    reciprocal = 2 * np.pi * np.linalg.inv(cell).T
+    step_vectors = reciprocal / mp_grid[:, None]
+    # Search all of the vectors within a sphere, which is enlarged until it holds enough shells
+    radius = 2 * np.linalg.norm(step_vectors, axis=1).max()
+    while True:
+        # (a vector of length r has at most r |a_i| / 2 pi steps of b_i / N_i along each b_i)
+        limits = np.ceil(radius * np.linalg.norm(cell, axis=1) * mp_grid / (2 * np.pi))
+        axes = [np.arange(-limit, limit + 1, dtype=np.int64) for limit in limits.astype(int)]
+        steps = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+        vectors = steps @ step_vectors
+        lengths = np.linalg.norm(vectors, axis=1)
+        inside = (lengths > kmesh_tol) & (lengths <= radius)
+        order = np.argsort(lengths[inside], kind="stable")
+        steps, vectors, lengths = (
+            steps[inside][order],
+            vectors[inside][order],
+            lengths[inside][order],
+        )
+        # (the vectors of the outermost shell within the sphere may straddle its surface, so the
+        # shells are only complete up to the one before)
+        ends = np.flatnonzero(np.diff(lengths) > kmesh_tol)
+        if len(ends) >= num_shells:
+            end = ends[num_shells - 1] + 1
+            return steps[:end], vectors[:end], lengths[:end]
+        radius *= 2
+
+
+def nnkpts(shells: BvectorShells, mp_grid: Any, kpoints: Any = None) -> np.ndarray:
+    """Return the nearest neighbours of each k-point, as the (N M, 5) rows of ``nnkpts``.
+
+    Each row holds the (1-based) index of a k-point, that of its neighbour along a b-vector, and
+    the reciprocal lattice vector G that brings the neighbour to k + b, in the order of the
+    k-points and then of the b-vectors of ``shells``.
+
+    :param kpoints: the k-points of the mesh in fractional coordinates, in any order; by default,
+        those of :func:`monkhorst_pack`
+    :raises ValueError: if the k-points are not exactly the points of the mesh
+    """
+    grid = np.array(mp_grid, dtype=np.int64)
+    if kpoints is None:
+        kpoints = monkhorst_pack(tuple(grid.tolist()))
+    scaled = np.asarray(kpoints, dtype=np.float64) * grid
+    points = np.rint(scaled).astype(np.int64)
+    if not np.allclose(scaled, points, rtol=0, atol=1e-6):
+        raise ValueError(f"The kpoints are not the points of mp_grid = {grid.tolist()}")
+
+    def flat_index(points: np.ndarray) -> np.ndarray:
+        points = points % grid
+        flat: np.ndarray = (points[..., 0] * grid[1] + points[..., 1]) * grid[2] + points[..., 2]
+        return flat
+
+    # The index of the k-point at each point of the mesh
+    index = np.full(int(grid.prod()), -1, dtype=np.int64)
+    index[flat_index(points)] = np.arange(len(points))
+    if len(points) != len(index) or np.any(index < 0):
+        raise ValueError(f"The kpoints are not the points of mp_grid = {grid.tolist()}")
+
+    neighbours = points[:, None, :] + shells.steps[None, :, :]
+    rows = np.empty((*neighbours.shape[:2], 5), dtype=np.int32)
+    rows[..., 0] = np.arange(1, len(points) + 1)[:, None]
+    rows[..., 1] = index[flat_index(neighbours)] + 1
+    rows[..., 2:] = neighbours // grid
+    return rows.reshape(-1, 5)
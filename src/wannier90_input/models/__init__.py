@@ -4,3 +4,4 @@ from pathlib import Path
 
 directory = Path(__file__).parent
 versions = ["latest"] + [v.name[:-3] for v in directory.glob("sha_*.py")]
+keywords = (directory / "keywords.txt").read_text().split()
@@ -6,7 +6,7 @@ This file has been generated automatically. Do not edit it manually.
 # ruff: noqa
 
 from pydantic import Field
-from typing import Annotated, Literal
+from typing import Annotated, ClassVar, Literal
 from wannier90_input.models.template import Wannier90InputTemplate
 from wannier90_input.models.parameters import (
     AtomFrac,
@@ -17,29 +17,358 @@ from wannier90_input.models.parameters import (
     SpecialPoint,
     Projection,
     NearestNeighborKpoint,
+    CartesianAtoms,
+    CentreConstraints,
     Coordinate,
+    DisentanglementSpheres,
+    FractionalAtoms,
     FractionalCoordinate,
+    IndexRanges,
+    Kpoints,
+    NearestNeighborKpoints,
+    UnitCell,
 )
 
 
 class Wannier90Input(Wannier90InputTemplate):
     """Pydantic model for the input of `Wannier90.`"""
 
+    keyword_table: ClassVar[dict[str, str]] = {
+        "num_wann": "num_wann",
+        "num_bands": "num_bands",
+        "unit_cell_cart": "unit_cell_cart",
+        "atoms_cart": "atoms_cart",
+        "atoms_frac": "atoms_frac",
+        "mp_grid": "mp_grid",
+        "kpoints": "kpoints",
+        "gamma_only": "gamma_only",
+        "spinors": "spinors",
+        "shell_list": "shell_list",
+        "search_shells": "search_shells",
+        "skip_b1_tests": "skip_B1_tests",
+        "nnkpts": "nnkpts",
+        "kmesh_tol": "kmesh_tol",
+        "higher_order_n": "higher_order_n",
+        "higher_order_nearest_shells": "higher_order_nearest_shells",
+        "postproc_setup": "postproc_setup",
+        "exclude_bands": "exclude_bands",
+        "select_projections": "select_projections",
+        "auto_projections": "auto_projections",
+        "restart": "restart",
+        "iprint": "iprint",
+        "length_unit": "length_unit",
+        "wvfn_formatted": "wvfn_formatted",
+        "spin": "spin",
+        "timing_level": "timing_level",
+        "optimisation": "optimisation",
+        "translate_home_cell": "translate_home_cell",
+        "write_xyz": "write_xyz",
+        "write_vdw_data": "write_vdw_data",
+        "write_hr_diag": "write_hr_diag",
+        "dis_win_min": "dis_win_min",
+        "dis_win_max": "dis_win_max",
+        "dis_froz_min": "dis_froz_min",
+        "dis_froz_max": "dis_froz_max",
+        "dis_froz_proj": "dis_froz_proj",
+        "dis_proj_min": "dis_proj_min",
+        "dis_proj_max": "dis_proj_max",
+        "dis_num_iter": "dis_num_iter",
+        "dis_mix_ratio": "dis_mix_ratio",
+        "dis_conv_tol": "dis_conv_tol",
+        "dis_conv_window": "dis_conv_window",
+        "dis_spheres_num": "dis_spheres_num",
+        "dis_spheres_first_wann": "dis_spheres_first_wann",
+        "dis_spheres": "dis_spheres",
+        "num_iter": "num_iter",
+        "num_cg_steps": "num_cg_steps",
+        "conv_window": "conv_window",
+        "conv_tol": "conv_tol",
+        "precond": "precond",
+        "conv_noise_amp": "conv_noise_amp",
+        "conv_noise_num": "conv_noise_num",
+        "num_dump_cycles": "num_dump_cycles",
+        "num_print_cycles": "num_print_cycles",
+        "write_r2mn": "write_r2mn",
+        "guiding_centres": "guiding_centres",
+        "num_guide_cycles": "num_guide_cycles",
+        "num_no_guide_iter": "num_no_guide_iter",
+        "trial_step": "trial_step",
+        "fixed_step": "fixed_step",
+        "use_bloch_phases": "use_bloch_phases",
+        "site_symmetry": "site_symmetry",
+        "symmetrize_eps": "symmetrize_eps",
+        "slwf_num": "slwf_num",
+        "slwf_constrain": "slwf_constrain",
+        "slwf_lambda": "slwf_lambda",
+        "slwf_centres": "slwf_centres",
+        "wannier_plot": "wannier_plot",
+        "wannier_plot_list": "wannier_plot_list",
+        "wannier_plot_supercell": "wannier_plot_supercell",
+        "wannier_plot_format": "wannier_plot_format",
+        "wannier_plot_mode": "wannier_plot_mode",
+        "wannier_plot_radius": "wannier_plot_radius",
+        "wannier_plot_scale": "wannier_plot_scale",
+        "wannier_plot_spinor_mode": "wannier_plot_spinor_mode",
+        "wannier_plot_spinor_phase": "wannier_plot_spinor_phase",
+        "bands_plot": "bands_plot",
+        "kpoint_path": "kpoint_path",
+        "bands_num_points": "bands_num_points",
+        "bands_plot_format": "bands_plot_format",
+        "bands_plot_project": "bands_plot_project",
+        "bands_plot_mode": "bands_plot_mode",
+        "bands_plot_dim": "bands_plot_dim",
+        "fermi_surface_plot": "fermi_surface_plot",
+        "fermi_surface_num_points": "fermi_surface_num_points",
+        "fermi_energy": "fermi_energy",
+        "fermi_energy_min": "fermi_energy_min",
+        "fermi_energy_max": "fermi_energy_max",
+        "fermi_energy_step": "fermi_energy_step",
+        "fermi_surface_plot_format": "fermi_surface_plot_format",
+        "hr_plot": "hr_plot",
+        "write_hr": "write_hr",
+        "write_rmn": "write_rmn",
+        "write_bvec": "write_bvec",
+        "write_tb": "write_tb",
+        "hr_cutoff": "hr_cutoff",
+        "dist_cutoff": "dist_cutoff",
+        "dist_cutoff_mode": "dist_cutoff_mode",
+        "translation_centre_frac": "translation_centre_frac",
+        "use_ws_distance": "use_ws_distance",
+        "ws_distance_tol": "ws_distance_tol",
+        "ws_search_size": "ws_search_size",
+        "write_u_matrices": "write_u_matrices",
+        "transport": "transport",
+        "transport_mode": "transport_mode",
+        "tran_win_min": "tran_win_min",
+        "tran_win_max": "tran_win_max",
+        "tran_energy_step": "tran_energy_step",
+        "tran_num_bb": "tran_num_bb",
+        "tran_num_ll": "tran_num_ll",
+        "tran_num_rr": "tran_num_rr",
+        "tran_num_cc": "tran_num_cc",
+        "tran_num_lc": "tran_num_lc",
+        "tran_num_cr": "tran_num_cr",
+        "tran_num_cell_ll": "tran_num_cell_ll",
+        "tran_num_cell_rr": "tran_num_cell_rr",
+        "tran_num_bandc": "tran_num_bandc",
+        "tran_write_ht": "tran_write_ht",
+        "tran_read_ht": "tran_read_ht",
+        "tran_use_same_lead": "tran_use_same_lead",
+        "tran_group_threshold": "tran_group_threshold",
+        "one_dim_axis": "one_dim_axis",
+        "use_ss_functional": "use_ss_functional",
+        "projections": "projections",
+        "adpt_smr": "adpt_smr",
+        "adpt_smr_fac": "adpt_smr_fac",
+        "adpt_smr_max": "adpt_smr_max",
+        "band_list": "band_list",
+        "berry": "berry",
+        "berry_curv_adpt_kmesh": "berry_curv_adpt_kmesh",
+        "berry_curv_adpt_kmesh_thresh": "berry_curv_adpt_kmesh_thresh",
+        "berry_curv_unit": "berry_curv_unit",
+        "berry_task": "berry_task",
+        "boltz_2d_dir": "boltz_2d_dir",
+        "boltz_bandshift": "boltz_bandshift",
+        "boltz_bandshift_energyshift": "boltz_bandshift_energyshift",
+        "boltz_bandshift_firstband": "boltz_bandshift_firstband",
+        "boltz_calc_also_dos": "boltz_calc_also_dos",
+        "boltz_dos_energy_max": "boltz_dos_energy_max",
+        "boltz_dos_energy_min": "boltz_dos_energy_min",
+        "boltz_dos_energy_step": "boltz_dos_energy_step",
+        "boltz_mu_max": "boltz_mu_max",
+        "boltz_mu_min": "boltz_mu_min",
+        "boltz_mu_step": "boltz_mu_step",
+        "boltz_relax_time": "boltz_relax_time",
+        "boltz_tdf_energy_step": "boltz_tdf_energy_step",
+        "boltz_tdf_smr_fixed_en_width": "boltz_tdf_smr_fixed_en_width",
+        "boltz_tdf_smr_type": "boltz_tdf_smr_type",
+        "boltz_temp_max": "boltz_temp_max",
+        "boltz_temp_min": "boltz_temp_min",
+        "boltz_temp_step": "boltz_temp_step",
+        "boltzwann": "boltzwann",
+        "dos": "dos",
+        "dos_energy_max": "dos_energy_max",
+        "dos_energy_min": "dos_energy_min",
+        "dos_energy_step": "dos_energy_step",
+        "dos_project": "dos_project",
+        "dos_task": "dos_task",
+        "fixed_en_width": "fixed_en_width",
+        "geninterp": "geninterp",
+        "geninterp_alsofirstder": "geninterp_alsofirstder",
+        "geninterp_single_file": "geninterp_single_file",
+        "gyrotropic": "gyrotropic",
+        "gyrotropic_box_b1": "gyrotropic_box_b1",
+        "gyrotropic_box_b2": "gyrotropic_box_b2",
+        "gyrotropic_box_b3": "gyrotropic_box_b3",
+        "gyrotropic_box_center": "gyrotropic_box_center",
+        "gyrotropic_degen_thresh": "gyrotropic_degen_thresh",
+        "gyrotropic_eigval_max": "gyrotropic_eigval_max",
+        "gyrotropic_freq_max": "gyrotropic_freq_max",
+        "gyrotropic_freq_min": "gyrotropic_freq_min",
+        "gyrotropic_freq_step": "gyrotropic_freq_step",
+        "gyrotropic_task": "gyrotropic_task",
+        "kdotp_bands": "kdotp_bands",
+        "kdotp_kpoint": "kdotp_kpoint",
+        "kdotp_num_bands": "kdotp_num_bands",
+        "kmesh": "kmesh",
+        "kmesh_spacing": "kmesh_spacing",
+        "kpath": "kpath",
+        "kpath_bands_colour": "kpath_bands_colour",
+        "kpath_num_points": "kpath_num_points",
+        "kpath_task": "kpath_task",
+        "kslice": "kslice",
+        "kslice_2dkmesh": "kslice_2dkmesh",
+        "kslice_b1": "kslice_b1",
+        "kslice_b2": "kslice_b2",
+        "kslice_corner": "kslice_corner",
+        "kslice_fermi_level": "kslice_fermi_level",
+        "kslice_fermi_lines_colour": "kslice_fermi_lines_colour",
+        "kslice_task": "kslice_task",
+        "kubo_eigval_max": "kubo_eigval_max",
+        "kubo_freq_max": "kubo_freq_max",
+        "kubo_freq_min": "kubo_freq_min",
+        "kubo_freq_step": "kubo_freq_step",
+        "num_elec_per_state": "num_elec_per_state",
+        "num_valence_bands": "num_valence_bands",
+        "sc_eta": "sc_eta",
+        "sc_phase_conv": "sc_phase_conv",
+        "sc_use_eta_corr": "sc_use_eta_corr",
+        "sc_w_thr": "sc_w_thr",
+        "scissors_shift": "scissors_shift",
+        "shc_alpha": "shc_alpha",
+        "shc_bandshift": "shc_bandshift",
+        "shc_bandshift_energyshift": "shc_bandshift_energyshift",
+        "shc_bandshift_firstband": "shc_bandshift_firstband",
+        "shc_beta": "shc_beta",
+        "shc_freq_scan": "shc_freq_scan",
+        "shc_gamma": "shc_gamma",
+        "shc_method": "shc_method",
+        "smr_fixed_en_width": "smr_fixed_en_width",
+        "smr_type": "smr_type",
+        "spin_axis_azimuth": "spin_axis_azimuth",
+        "spin_axis_polar": "spin_axis_polar",
+        "spin_decomp": "spin_decomp",
+        "spin_moment": "spin_moment",
+        "spn_formatted": "spn_formatted",
+        "transl_inv": "transl_inv",
+        "transl_inv_full": "transl_inv_full",
+        "uhu_formatted": "uHu_formatted",
+    }
+    postw90_keywords: ClassVar[frozenset[str]] = frozenset(
+        [
+            "adpt_smr",
+            "adpt_smr_fac",
+            "adpt_smr_max",
+            "band_list",
+            "berry",
+            "berry_curv_adpt_kmesh",
+            "berry_curv_adpt_kmesh_thresh",
+            "berry_curv_unit",
+            "berry_task",
+            "boltz_2d_dir",
+            "boltz_bandshift",
+            "boltz_bandshift_energyshift",
+            "boltz_bandshift_firstband",
+            "boltz_calc_also_dos",
+            "boltz_dos_energy_max",
+            "boltz_dos_energy_min",
+            "boltz_dos_energy_step",
+            "boltz_mu_max",
+            "boltz_mu_min",
+            "boltz_mu_step",
+            "boltz_relax_time",
+            "boltz_tdf_energy_step",
+            "boltz_tdf_smr_fixed_en_width",
+            "boltz_tdf_smr_type",
+            "boltz_temp_max",
+            "boltz_temp_min",
+            "boltz_temp_step",
+            "boltzwann",
+            "dos",
+            "dos_energy_max",
+            "dos_energy_min",
+            "dos_energy_step",
+            "dos_project",
+            "dos_task",
+            "fixed_en_width",
+            "geninterp",
+            "geninterp_alsofirstder",
+            "geninterp_single_file",
+            "gyrotropic",
+            "gyrotropic_box_b1",
+            "gyrotropic_box_b2",
+            "gyrotropic_box_b3",
+            "gyrotropic_box_center",
+            "gyrotropic_degen_thresh",
+            "gyrotropic_eigval_max",
+            "gyrotropic_freq_max",
+            "gyrotropic_freq_min",
+            "gyrotropic_freq_step",
+            "gyrotropic_task",
+            "kdotp_bands",
+            "kdotp_kpoint",
+            "kdotp_num_bands",
+            "kmesh",
+            "kmesh_spacing",
+            "kpath",
+            "kpath_bands_colour",
+            "kpath_num_points",
+            "kpath_task",
+            "kslice",
+            "kslice_2dkmesh",
+            "kslice_b1",
+            "kslice_b2",
+            "kslice_corner",
+            "kslice_fermi_level",
+            "kslice_fermi_lines_colour",
+            "kslice_task",
+            "kubo_eigval_max",
+            "kubo_freq_max",
+            "kubo_freq_min",
+            "kubo_freq_step",
+            "num_elec_per_state",
+            "num_valence_bands",
+            "sc_eta",
+            "sc_phase_conv",
+            "sc_use_eta_corr",
+            "sc_w_thr",
+            "scissors_shift",
+            "shc_alpha",
+            "shc_bandshift",
+            "shc_bandshift_energyshift",
+            "shc_bandshift_firstband",
+            "shc_beta",
+            "shc_freq_scan",
+            "shc_gamma",
+            "shc_method",
+            "smr_fixed_en_width",
+            "smr_type",
+            "spin_axis_azimuth",
+            "spin_axis_polar",
+            "spin_decomp",
+            "spin_moment",
+            "spn_formatted",
+            "transl_inv",
+            "transl_inv_full",
+            "uHu_formatted",
+        ]
+    )
+
     num_wann: int = Field(..., description="Number of WF")
     num_bands: int | None = Field(None, description="Number of bands passed to the code")
-    unit_cell_cart: list[Coordinate] = Field(
+    unit_cell_cart: UnitCell = Field(
         description="Unit cell in cartesian coordinates", min_length=3, max_length=3
     )
-    atoms_cart: list[AtomCart] | None = Field(
+    atoms_cart: CartesianAtoms | None = Field(
         None, description="Positions of atoms in Cartesian coordinates"
     )
-    atoms_frac: list[AtomFrac] | None = Field(
+    atoms_frac: FractionalAtoms | None = Field(
         None, description="Positions of atoms in fractional coordinates"
     )
     mp_grid: tuple[int, int, int] = Field(
         ..., description="Dimensions of the Monkhorst-Pack grid of k-points"
     )
-    kpoints: list[FractionalCoordinate] = Field(
+    kpoints: Kpoints = Field(
         default_factory=list, description="k-points in relative crystallographic units"
     )
     gamma_only: bool = Field(
@@ -53,7 +382,7 @@ class Wannier90Input(Wannier90InputTemplate):
         36, description="The number of shells to search when determining finite difference formula"
     )
     skip_B1_tests: bool = Field(False, description="Check the condition B1 of Ref [@marzari-prb97]")
-    nnkpts: list[NearestNeighborKpoint] = Field(
+    nnkpts: NearestNeighborKpoints = Field(
         default_factory=list, description="Explicit list of nearest-neighbour k-points"
     )
     kmesh_tol: float = Field(
@@ -66,11 +395,11 @@ class Wannier90Input(Wannier90InputTemplate):
         False, description="Use the b-vectors on the nearest shells"
     )
     postproc_setup: bool = Field(False, description="To output the `seedname.nnkp` file")
-    exclude_bands: list[int] = Field(
-        default_factory=list, description="List of bands to exclude from the calculation"
+    exclude_bands: IndexRanges = Field(
+        default_factory=IndexRanges, description="List of bands to exclude from the calculation"
     )
-    select_projections: list[int] = Field(
-        default_factory=list, description="List of projections to use in Wannierisation"
+    select_projections: IndexRanges = Field(
+        default_factory=IndexRanges, description="List of projections to use in Wannierisation"
     )
     auto_projections: bool = Field(
         False, description="To automatically generate initial projections"
@@ -136,7 +465,7 @@ class Wannier90Input(Wannier90InputTemplate):
     dis_spheres_first_wann: int = Field(
         1, description="Index of the first band to be considered a Wannier function"
     )
-    dis_spheres: list[DisentanglementSphere] = Field(
+    dis_spheres: DisentanglementSpheres = Field(
         default_factory=list,
         description="List of centres and radii, for disentanglement only in spheres",
     )
@@ -187,12 +516,14 @@ class Wannier90Input(Wannier90InputTemplate):
     slwf_lambda: float = Field(
         0.0, description="Value of the Lagrange multiplier for constraining the objective WFs"
     )
-    slwf_centres: list[CentreConstraint] = Field(
+    slwf_centres: CentreConstraints = Field(
         default_factory=list,
         description="The centres to which the objective WFs are to be constrained",
     )
     wannier_plot: bool = Field(False, description="Plot the WF")
-    wannier_plot_list: list[int] = Field(default_factory=list, description="List of WF to plot")
+    wannier_plot_list: IndexRanges = Field(
+        default_factory=IndexRanges, description="List of WF to plot"
+    )
     wannier_plot_supercell: int = Field(2, description="Size of the supercell for plotting the WF")
     wannier_plot_format: Literal["xcrysden", "cube"] = Field(
         "xcrysden", description="File format in which to plot the WF"
@@ -218,8 +549,8 @@ class Wannier90Input(Wannier90InputTemplate):
     bands_plot_format: Literal["gnuplot", "xmgrace"] = Field(
         "gnuplot", description="File format in which to plot the interpolated bands"
     )
-    bands_plot_project: list[int] = Field(
-        default_factory=list, description="WF to project the band structure onto"
+    bands_plot_project: IndexRanges = Field(
+        default_factory=IndexRanges, description="WF to project the band structure onto"
     )
     bands_plot_mode: Literal["s-k", "cut"] = Field(
         "s-k", description="Slater-Koster type interpolation or Hamiltonian cut-off"
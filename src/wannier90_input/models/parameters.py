@@ -1,40 +1,321 @@
 """Pydantic models for various `Wannier90` input parameters."""
 
+import os
 import textwrap
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
 from enum import Enum
-from typing import Annotated, Any, Literal
+from functools import cache, lru_cache
+from itertools import chain
+from typing import Annotated, Any, Literal, NamedTuple, TypeVar, get_args, get_origin
 
-from pydantic import BaseModel, Field, model_validator
+import numpy as np
+from numpy.typing import DTypeLike
+from pydantic import BaseModel, Field, GetCoreSchemaHandler, model_validator
+from pydantic_core import CoreSchema, core_schema
 
 Fraction = Annotated[float, Field(ge=0.0, le=1.0)]
 FractionalCoordinate = Annotated[list[Fraction], Field(min_length=3, max_length=3)]
 Coordinate = Annotated[list[float], Field(min_length=3, max_length=3)]
 
 
-class AtomFrac(BaseModel):
+class ArrayField:
+    """Allow a list-valued field to hold its data as a (read-only) NumPy array instead.
+
+    Arrays, ``.npy`` paths (memory-mapped) and lists of float rows are checked in one vectorised
+    pass, and arrays are serialised as the lists that they stand for.
+
+    :param dtype: the dtype of the array, which can be structured (e.g. for atoms)
+    :param shape: the shape of the array, with None for the dimensions of any length
+    :param bounds: the range of the elements, or of those of some fields of a structured dtype
+    :param row_model: the ``ArrayRow`` model of the items of the list, if any
+    """
+
+    def __init__(
+        self,
+        dtype: DTypeLike,
+        shape: tuple[int | None, ...],
+        bounds: tuple[float, float] | dict[str, tuple[float, float]] | None = None,
+        row_model: type["ArrayRow"] | None = None,
+    ):
+        """Describe the arrays that a field accepts."""
+        self.dtype = np.dtype(dtype)
+        self.shape = shape
+        self.bounds = bounds
+        self.row_model = row_model
+        # Whether lists of rows of floats can be checked in one pass (see _is_float_rows)
+        self._rows_of_floats = self.dtype == np.float64 and len(shape) == 2 and shape[0] is None
+
+    def __get_pydantic_core_schema__(
+        self, source: Any, handler: GetCoreSchemaHandler
+    ) -> CoreSchema:
+        """Extend the schema of the list with the validation and serialisation of arrays."""
+        list_schema = handler(source)
+        return core_schema.json_or_python_schema(
+            json_schema=list_schema,
+            python_schema=core_schema.no_info_wrap_validator_function(self._validate, list_schema),
+            serialization=core_schema.wrap_serializer_function_ser_schema(
+                self._serialize, schema=list_schema
+            ),
+        )
+
+    def _validate(self, value: Any, handler: Callable[[Any], Any]) -> Any:
+        # (lists, e.g. those of parsed files, are checked first as they are the most common)
+        if type(value) is list:
+            if self._is_float_rows(value):
+                if value:
+                    rows = np.fromiter(chain.from_iterable(value), self.dtype)
+                    check_bounds(rows.reshape(len(value), -1), self._bounds_of())
+                # (a copy, as the handler would return, so that the list can't be changed later)
+                return list(map(list.copy, value))
+            return handler(value)
+        if isinstance(value, np.ndarray):
+            return self.validate_array(value)
+        if isinstance(value, os.PathLike) or (isinstance(value, str) and value.endswith(".npy")):
+            return self.validate_array(load_array(value))
+        return handler(value)
+
+    def _is_float_rows(self, value: list[Any]) -> bool:
+        """Return whether ``value`` is a list of rows of any number, all of Python floats."""
+        return (
+            self._rows_of_floats
+            and set(map(type, value)) <= {list}
+            and set(map(len, value)) <= {self.shape[1]}
+            and set(map(type, chain.from_iterable(value))) <= {float}
+        )
+
+    def _serialize(self, value: Any, handler: Callable[[Any], Any]) -> Any:
+        return handler(self.to_list(value) if isinstance(value, np.ndarray) else value)
+
+    def validate_array(self, array: np.ndarray) -> np.ndarray:
+        """Check the shape, dtype and range of ``array``, and return a read-only view of it."""
+        if array.ndim != len(self.shape) or any(
+            n is not None and n != m for n, m in zip(self.shape, array.shape, strict=False)
+        ):
+            shape = ", ".join("n" if n is None else str(n) for n in self.shape)
+            shape = f"({shape},)" if len(self.shape) == 1 else f"({shape})"
+            raise ValueError(f"Expected an array of shape {shape}, got {array.shape}")
+        dtype = self._cast_dtype(array.dtype)
+        if array.dtype != dtype and not isinstance(array, np.memmap):
+            array = array.astype(dtype)
+        if self.dtype.names is None:
+            check_bounds(array, self._bounds_of())
+        else:
+            for name in self.dtype.names:
+                if self.dtype[name].kind != "U":
+                    check_bounds(array[name], self._bounds_of(name))
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    def _bounds_of(self, name: str | None = None) -> tuple[float, float] | None:
+        """Return the range of the elements of the array (or of its field ``name``)."""
+        if isinstance(self.bounds, dict):
+            return None if name is None else self.bounds.get(name)
+        return self.bounds
+
+    def _cast_dtype(self, dtype: np.dtype) -> np.dtype:
+        """Return the dtype to which an array of ``dtype`` is converted."""
+        if self.dtype.names is None:
+            if not np.can_cast(dtype, self.dtype, casting="same_kind"):
+                raise ValueError(f"Expected an array of {self.dtype}, got {dtype}")
+            return self.dtype
+        if dtype.names != self.dtype.names:
+            raise ValueError(f"Expected an array with the fields {self.dtype.names}, got {dtype}")
+        fields = []
+        for name in self.dtype.names:
+            expected, given = self.dtype[name], dtype[name]
+            if expected.kind == "U" and given.kind == "U":
+                fields.append((name, given))
+            elif expected.shape == given.shape and np.can_cast(
+                given.base, expected.base, casting="same_kind"
+            ):
+                fields.append((name, expected))
+            else:
+                raise ValueError(f"Expected the field `{name}` of {expected}, got {given}")
+        return np.dtype(fields)
+
+    def from_columns(self, *columns: Any) -> np.ndarray:
+        """Create a (not validated) structured array from the values of each of its fields."""
+        names = self.dtype.names
+        if names is None:
+            raise TypeError(f"Arrays of {self.dtype} have no columns")
+        arrays = []
+        for name, column in zip(names, columns, strict=True):
+            dtype = self.dtype[name]
+            array = np.asarray(column, dtype=str if dtype.kind == "U" else dtype.base)
+            arrays.append(array.reshape(-1, *dtype.shape))
+        if len({len(array) for array in arrays}) > 1:
+            raise ValueError(f"All of the columns {names} must have the same length")
+        records = np.empty(
+            len(arrays[0]),
+            [(name, a.dtype, a.shape[1:]) for name, a in zip(names, arrays, strict=True)],
+        )
+        for name, array in zip(names, arrays, strict=True):
+            records[name] = array
+        return records
+
+    def to_list(self, array: np.ndarray) -> list[Any]:
+        """Convert an array to the list that it stands for."""
+        rows: list[Any] = array.tolist()
+        if self.row_model is None:
+            return rows
+        return [self.row_model.from_row(row) for row in rows]
+
+    def to_array(self, value: Any) -> np.ndarray:
+        """Convert a list (or an array) to an array."""
+        if isinstance(value, np.ndarray):
+            return value
+        if self.row_model is not None:
+            value = [row.to_row() for row in value]
+        if self.dtype.names is not None:
+            columns = zip(*value, strict=True) if value else [[]] * len(self.dtype.names)
+            return self.from_columns(*columns)
+        shape = tuple(-1 if n is None else n for n in self.shape)
+        return np.array(value, dtype=self.dtype).reshape(shape)
+
+
+def load_array(path: str | os.PathLike[str]) -> np.ndarray:
+    """Memory-map the array saved in the ``.npy`` file at ``path`` (read-only)."""
+    try:
+        array = np.load(path, mmap_mode="r", allow_pickle=False)
+    except OSError as err:
+        raise ValueError(f"Cannot read an array from `{path}`: {err}") from err
+    if not isinstance(array, np.ndarray):
+        array.close()
+        raise ValueError(f"`{path}` does not contain a single array")  # noqa: TRY004
+    return array
+
+
+def check_bounds(
+    array: np.ndarray, bounds: tuple[float, float] | None, chunk_rows: int = 2**16
+) -> None:
+    """Check, ``chunk_rows`` rows at a time, that all elements of an array lie within ``bounds``.
+
+    :raises ValueError: naming the first row of the (1D or 2D) array with an element out of bounds
+    """
+    if bounds is None or not array.size:
+        return
+    low, high = bounds
+    rows = array.reshape(-1, array.shape[-1])
+    for start in range(0, len(rows), chunk_rows):
+        chunk = rows[start : start + chunk_rows]
+        outside = np.flatnonzero(~((chunk >= low) & (chunk <= high)).all(axis=1))
+        if len(outside):
+            row = start + outside[0]
+            values = " ".join(map(str, rows[row].tolist()))
+            where = f"Row {row} ({values})" if array.ndim > 1 else f"({values})"
+            raise ValueError(f"{where} has elements outside the range [{low}, {high}]")
+
+
+class ArrayModel(BaseModel):
+    """A model some of whose fields can hold NumPy arrays (see :class:`ArrayField`)."""
+
+    def __eq__(self, other: object) -> bool:
+        """Compare two models, including any fields that hold NumPy arrays."""
+        if type(other) is not type(self):
+            return super().__eq__(other)
+        fields = array_fields(type(self))
+        arrays = [
+            name
+            for name in fields
+            if isinstance(self.__dict__.get(name), np.ndarray)
+            or isinstance(other.__dict__.get(name), np.ndarray)
+        ]
+        if not arrays:
+            return super().__eq__(other)
+        for name in arrays:
+            field, value, other_value = fields[name], self.__dict__[name], other.__dict__[name]
+            if value is None or other_value is None:
+                return False
+            if not np.array_equal(field.to_array(value), field.to_array(other_value)):
+                return False
+        # Compare the other fields as pydantic does
+        update = dict.fromkeys(arrays)
+        return super(ArrayModel, self.model_copy(update=update)).__eq__(
+            other.model_copy(update=update)
+        )
+
+
+@cache
+def array_fields(model: type[BaseModel]) -> dict[str, ArrayField]:
+    """Return the fields of ``model`` that can hold arrays (including optional ones)."""
+    fields = {}
+    for name, field in model.model_fields.items():
+        metadata = list(field.metadata)
+        for arg in get_args(field.annotation):
+            if get_origin(arg) is Annotated:
+                metadata.extend(arg.__metadata__)
+        for item in metadata:
+            if isinstance(item, ArrayField):
+                fields[name] = item
+    return fields
+
+
+class ArrayRow(ArrayModel, ABC):
+    """A model that stands for one row of an array (see :class:`ArrayField`)."""
+
+    @classmethod
+    @abstractmethod
+    def from_row(cls, row: Any) -> "ArrayRow":
+        """Create the model from a row of an array."""
+
+    @abstractmethod
+    def to_row(self) -> Any:
+        """Return the row of an array that stands for the model."""
+
+
+# A position, which can also be given as an array of shape (3,)
+Position = Annotated[Coordinate, ArrayField(np.float64, (3,))]
+FractionalPosition = Annotated[
+    FractionalCoordinate, ArrayField(np.float64, (3,), bounds=(0.0, 1.0))
+]
+# The lattice vectors of a unit cell, which can also be given as an array of shape (3, 3)
+UnitCell = Annotated[list[Coordinate], ArrayField(np.float64, (3, 3))]
+
+
+class AtomFrac(ArrayRow):
     """One entry in the Wannier90 atoms_frac input parameter."""
 
     symbol: str = Field(..., description="Atomic symbol")
-    position: FractionalCoordinate = Field(..., description="Fractional coordinates of the atom")
+    position: FractionalPosition = Field(..., description="Fractional coordinates of the atom")
 
     def __str__(self) -> str:
         return f"{self.symbol} {' '.join(map(str, self.position))}"
 
+    @classmethod
+    def from_row(cls, row: Any) -> "AtomFrac":
+        """Create the model from a (symbol, position) record of a structured array of atoms."""
+        return cls.model_construct(symbol=row[0], position=row[1].tolist())
 
-class AtomCart(BaseModel):
+    def to_row(self) -> Any:
+        """Return the record of a structured array of atoms that stands for the model."""
+        return (self.symbol, self.position)
+
+
+class AtomCart(ArrayRow):
     """One entry in the Wannier90 atoms_cart input parameter."""
 
     symbol: str = Field(..., description="Atomic symbol")
-    position: Coordinate = Field(..., description="Cartesian coordinates of the atom")
+    position: Position = Field(..., description="Cartesian coordinates of the atom")
 
     def __str__(self) -> str:
         return f"{self.symbol} {' '.join(map(str, self.position))}"
 
+    @classmethod
+    def from_row(cls, row: Any) -> "AtomCart":
+        """Create the model from a (symbol, position) record of a structured array of atoms."""
+        return cls.model_construct(symbol=row[0], position=row[1].tolist())
+
+    def to_row(self) -> Any:
+        """Return the record of a structured array of atoms that stands for the model."""
+        return (self.symbol, self.position)
+
 
-class DisentanglementSphere(BaseModel):
+class DisentanglementSphere(ArrayRow):
     """Wannier90 dis_spheres input parameter."""
 
-    center: FractionalCoordinate = Field(
+    center: FractionalPosition = Field(
         ..., description="Center of the sphere (in crystallographic coordinates)"
     )
     radius: float = Field(..., description="Radius of the sphere (inverse Angstrom)")
@@ -42,12 +323,21 @@ class DisentanglementSphere(BaseModel):
     def __str__(self) -> str:
         return f"{','.join(map(str, self.center))} {self.radius}"
 
+    @classmethod
+    def from_row(cls, row: Any) -> "DisentanglementSphere":
+        """Create the model from a (center, radius) record of a structured array of spheres."""
+        return cls.model_construct(center=row[0].tolist(), radius=row[1])
+
+    def to_row(self) -> Any:
+        """Return the record of a structured array of spheres that stands for the model."""
+        return (self.center, self.radius)
+
 
-class CentreConstraint(BaseModel):
+class CentreConstraint(ArrayRow):
     """Wannier90 slwf_centres input parameter."""
 
     number: int = Field(..., description="Wannier function index")
-    center: FractionalCoordinate = Field(
+    center: FractionalPosition = Field(
         ...,
         description="Centre on which to constrain the Wannier function (fractional coordinates)",
     )
@@ -55,6 +345,15 @@ class CentreConstraint(BaseModel):
     def __str__(self) -> str:
         return f"{self.number} {','.join(map(str, self.center))}"
 
+    @classmethod
+    def from_row(cls, row: Any) -> "CentreConstraint":
+        """Create the model from a (number, center) record of a structured array of centres."""
+        return cls.model_construct(number=row[0], center=row[1].tolist())
+
+    def to_row(self) -> Any:
+        """Return the record of a structured array of centres that stands for the model."""
+        return (self.number, self.center)
+
 
 class SpecialPoint(BaseModel):
     """Wannier90 kpoint_path input parameter."""
@@ -68,7 +367,7 @@ class SpecialPoint(BaseModel):
         return f"{self.name} {','.join(map(str, self.coordinates))}"
 
 
-class NearestNeighborKpoint(BaseModel):
+class NearestNeighborKpoint(ArrayRow):
     """Wannier90 nnkpts input parameter."""
 
     kpoint_number: int
@@ -81,6 +380,177 @@ class NearestNeighborKpoint(BaseModel):
             f"{' '.join(map(str, self.reciprocal_lattice_vector))}"
         )
 
+    @classmethod
+    def from_row(cls, row: list[Any]) -> "NearestNeighborKpoint":
+        """Create the model from a row of an (M, 5) array of nnkpts."""
+        return cls.model_construct(
+            kpoint_number=row[0], neighbor_kpoint_number=row[1], reciprocal_lattice_vector=row[2:]
+        )
+
+    def to_row(self) -> list[Any]:
+        """Return the row of an (M, 5) array of nnkpts that stands for the model."""
+        return [self.kpoint_number, self.neighbor_kpoint_number, *self.reciprocal_lattice_vector]
+
+
+# The k-points, which can also be given as an (N, 3) array
+Kpoints = Annotated[
+    list[FractionalCoordinate], ArrayField(np.float64, (None, 3), bounds=(0.0, 1.0))
+]
+# The atoms of a unit cell, which can also be given as a structured array with the fields
+# "symbol" (strings) and "position" (3 floats), e.g. from `ArrayField.from_columns`
+_atoms_dtype = [("symbol", str), ("position", np.float64, (3,))]
+FractionalAtoms = Annotated[
+    list[AtomFrac], ArrayField(_atoms_dtype, (None,), bounds=(0.0, 1.0), row_model=AtomFrac)
+]
+CartesianAtoms = Annotated[list[AtomCart], ArrayField(_atoms_dtype, (None,), row_model=AtomCart)]
+# The disentanglement spheres, and the centres of constrained Wannier functions, which can also
+# be given as structured arrays with the fields of their models (whose centres are checked at once)
+DisentanglementSpheres = Annotated[
+    list[DisentanglementSphere],
+    ArrayField(
+        [("center", np.float64, (3,)), ("radius", np.float64)],
+        (None,),
+        bounds={"center": (0.0, 1.0)},
+        row_model=DisentanglementSphere,
+    ),
+]
+CentreConstraints = Annotated[
+    list[CentreConstraint],
+    ArrayField(
+        [("number", np.int64), ("center", np.float64, (3,))],
+        (None,),
+        bounds={"center": (0.0, 1.0)},
+        row_model=CentreConstraint,
+    ),
+]
+# The nearest-neighbour k-points, which can also be given as an (M, 5) array
+NearestNeighborKpoints = Annotated[
+    list[NearestNeighborKpoint], ArrayField(np.int32, (None, 5), row_model=NearestNeighborKpoint)
+]
+
+
+_no_indices: tuple[int, ...] = ()
+
+
+class IndexRanges:
+    """A set of (1-based) indices stored as ranges, e.g. ``1-40,45`` for ``exclude_bands``."""
+
+    __slots__ = ("_ranges",)
+
+    def __init__(self, indices: Iterable[int] = _no_indices):
+        """Create the set of ``indices``."""
+        self._ranges: list[tuple[int, int]] = []
+        if indices is _no_indices:
+            # (e.g. the default of each index field, which is created for every model)
+            return
+        for index in sorted(set(indices)):
+            if self._ranges and index == self._ranges[-1][1] + 1:
+                self._ranges[-1] = (self._ranges[-1][0], index)
+            else:
+                self._ranges.append((index, index))
+        self._check()
+
+    @classmethod
+    def from_ranges(cls, ranges: Iterable[tuple[int, int]]) -> "IndexRanges":
+        """Create the union of the (inclusive) ranges ``(start, stop)``."""
+        merged: list[tuple[int, int]] = []
+        for start, stop in sorted(ranges):
+            if stop < start:
+                raise ValueError(f"Invalid range {start}-{stop}")
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(stop, merged[-1][1]))
+            else:
+                merged.append((start, stop))
+        indices = cls()
+        indices._ranges = merged
+        indices._check()
+        return indices
+
+    @classmethod
+    def from_string(cls, string: str) -> "IndexRanges":
+        """Parse e.g. ``"1-40, 45"`` (whose items can be separated by commas and/or spaces)."""
+        ranges = []
+        for item in string.replace(",", " ").split():
+            start, sep, stop = item.partition("-")
+            if not start.isdigit() or (sep and not stop.isdigit()):
+                raise ValueError(f"Invalid range `{item}` in `{string}`")
+            ranges.append((int(start), int(stop) if sep else int(start)))
+        return cls.from_ranges(ranges)
+
+    def _check(self) -> None:
+        if self._ranges and self._ranges[0][0] < 1:
+            raise ValueError(f"Indices must be positive, got {self._ranges[0][0]}")
+
+    @property
+    def ranges(self) -> tuple[tuple[int, int], ...]:
+        """The disjoint (inclusive) ranges ``(start, stop)`` of the indices, in order."""
+        return tuple(self._ranges)
+
+    def add(self, index: int) -> None:
+        """Add ``index`` to the set."""
+        if index not in self:
+            merged = IndexRanges.from_ranges([*self._ranges, (index, index)])
+            self._ranges = merged._ranges
+
+    # (so that code written for lists of indices keeps working)
+    append = add
+
+    def __contains__(self, index: object) -> bool:
+        return any(start <= index <= stop for start, stop in self._ranges)  # type: ignore[operator]
+
+    def __len__(self) -> int:
+        return sum(stop - start + 1 for start, stop in self._ranges)
+
+    def __iter__(self) -> Iterator[int]:
+        return chain.from_iterable(range(start, stop + 1) for start, stop in self._ranges)
+
+    def __bool__(self) -> bool:
+        return bool(self._ranges)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IndexRanges):
+            return self._ranges == other._ranges
+        if isinstance(other, list | tuple):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __str__(self) -> str:
+        return ",".join(
+            str(start) if start == stop else f"{start}-{stop}" for start, stop in self._ranges
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}.from_string({str(self)!r})"
+
+    @classmethod
+    def validate(cls, value: Any) -> "IndexRanges":
+        """Convert a string such as ``"1-40,45"``, or a list of indices, to index ranges."""
+        if isinstance(value, IndexRanges):
+            return value
+        if isinstance(value, str):
+            return cls.from_string(value)
+        if isinstance(value, list | tuple | range | set | np.ndarray) and all(
+            isinstance(index, int | np.integer) and not isinstance(index, bool) for index in value
+        ):
+            return cls(map(int, value))
+        raise ValueError(f"Expected a list of indices or a string such as `1-40,45`, got {value!r}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> CoreSchema:
+        """Validate index ranges from strings and lists of indices, and serialise them as lists."""
+        indices_schema = core_schema.list_schema(core_schema.int_schema())
+        return core_schema.json_or_python_schema(
+            json_schema=core_schema.no_info_after_validator_function(
+                cls.validate, core_schema.union_schema([core_schema.str_schema(), indices_schema])
+            ),
+            python_schema=core_schema.no_info_plain_validator_function(cls.validate),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                list, return_schema=indices_schema
+            ),
+        )
+
 
 class AngularMomentum(Enum):
     """Angular momentum options for Wannier90 projections."""
@@ -144,6 +614,15 @@ labels_to_mr: dict[str, tuple[int, int | None]] = {
 }
 
 
+class InternCacheInfo(NamedTuple):
+    """Statistics of the cache of interned objects of e.g. :meth:`Projection.from_string`."""
+
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
 class QuantumNumbers(BaseModel):
     """BaseModel that represents the `ang_mtm` information in Wannier90 projections."""
 
@@ -183,7 +662,20 @@ class QuantumNumbers(BaseModel):
 
     @classmethod
     def from_string(cls, ang_mtm: str) -> "QuantumNumbers":
-        """Create a QuantumNumbers object from a Wannier90 ang_mtm input string."""
+        """Create a QuantumNumbers object from a Wannier90 ang_mtm input string.
+
+        The objects are interned: the same string gives the same (frozen) object, from a cache of
+        the most recently parsed strings whose statistics are given by :meth:`cache_info`.
+        """
+        return _interned_quantum_numbers(cls, ang_mtm)
+
+    @classmethod
+    def cache_info(cls) -> InternCacheInfo:
+        """Return the statistics of the cache of :meth:`from_string`."""
+        return InternCacheInfo(*_interned_quantum_numbers.cache_info())
+
+    @classmethod
+    def _parse(cls, ang_mtm: str) -> "QuantumNumbers":
         if ";" in ang_mtm:
             raise ValueError(
                 "Multiple angular momenta channels in one line is not supported."
@@ -225,6 +717,8 @@ class QuantumNumbers(BaseModel):
 class Projection(BaseModel):
     """Wannier90 projections input parameter."""
 
+    model_config = {"frozen": True}
+
     fractional_site: FractionalCoordinate | None = Field(
         None, description="Site of the projection (fractional coordinates)"
     )
@@ -277,7 +771,20 @@ class Projection(BaseModel):
 
     @classmethod
     def from_string(cls, proj_str: str) -> "Projection":
-        """Create a Projection object from a string."""
+        """Create a Projection object from a string.
+
+        As for :meth:`QuantumNumbers.from_string`, the objects are interned, so identical
+        projections (e.g. those of every input of a high-throughput study) share one object.
+        """
+        return _interned_projection(cls, proj_str)
+
+    @classmethod
+    def cache_info(cls) -> InternCacheInfo:
+        """Return the statistics of the cache of :meth:`from_string`."""
+        return InternCacheInfo(*_interned_projection.cache_info())
+
+    @classmethod
+    def _parse(cls, proj_str: str) -> "Projection":
         if proj_str.startswith("c="):
             site_arg = "cartesian_site"
         elif proj_str.startswith("f="):
@@ -337,6 +844,42 @@ class Projection(BaseModel):
         return self.ang_mtm.number_of_orbitals()
 
 
+class ReadOnlyList(list[Any]):
+    """A list that cannot be modified, for the lists of the (shared) interned models."""
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("The lists of interned models are read-only: assign a new list instead")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+
+    def __reduce__(self) -> tuple[type["ReadOnlyList"], tuple[list[Any]]]:
+        return ReadOnlyList, (list(self),)
+
+
+_Model = TypeVar("_Model", bound=BaseModel)
+
+
+def _read_only_lists(model: _Model) -> _Model:
+    """Make the lists of a newly parsed ``model`` read-only, so that it can be shared."""
+    for name, value in model.__dict__.items():
+        if isinstance(value, list):
+            model.__dict__[name] = ReadOnlyList(value)
+    return model
+
+
+# (a bounded cache, rather than a table of every string seen, keeps the memory of long-running
+# processes bounded; parsing errors are not cached)
+@lru_cache(maxsize=1024)
+def _interned_quantum_numbers(cls: type[QuantumNumbers], ang_mtm: str) -> QuantumNumbers:
+    return _read_only_lists(cls._parse(ang_mtm))
+
+
+@lru_cache(maxsize=4096)
+def _interned_projection(cls: type[Projection], proj_str: str) -> Projection:
+    return _read_only_lists(cls._parse(proj_str))
+
+
 parameter_models: list[type[BaseModel]] = [
     AtomFrac,
     AtomCart,
@@ -349,8 +892,16 @@ parameter_models: list[type[BaseModel]] = [
 ]
 
 other_imports = [
+    "CartesianAtoms",
+    "CentreConstraints",
     "Coordinate",
+    "DisentanglementSpheres",
+    "FractionalAtoms",
     "FractionalCoordinate",
+    "IndexRanges",
+    "Kpoints",
+    "NearestNeighborKpoints",
+    "UnitCell",
 ]
 
 
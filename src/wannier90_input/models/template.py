@@ -1,84 +1,757 @@
 """Base model for the input of different versions of `Wannier90`."""
 
-from typing import Any
+import os
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from functools import cache
+from itertools import chain
+from math import prod
+from types import SimpleNamespace
+from typing import IO, Annotated, Any, ClassVar, NamedTuple
 
-from pydantic import BaseModel, ConfigDict, model_validator
+import numpy as np
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    PrivateAttr,
+    TypeAdapter,
+    ValidationError,
+    ValidationInfo,
+    field_validator,
+    model_validator,
+)
+from pydantic_core import from_json
 from typing_extensions import Self
 
+from wannier90_input.cell import (
+    LengthUnit,
+    cartesian_to_fractional,
+    fractional_to_cartesian,
+    to_angstrom,
+)
+from wannier90_input.kmesh import BvectorShells, bvector_shells, monkhorst_pack, nnkpts
+from wannier90_input.models.parameters import (
+    ArrayModel,
+    AtomCart,
+    AtomFrac,
+    CentreConstraint,
+    DisentanglementSphere,
+    IndexRanges,
+    NearestNeighborKpoint,
+    array_fields,
+)
+from wannier90_input.parse import LazyWinFile, Source, iter_lines, parse_lines
 
-class Wannier90InputTemplate(BaseModel):
+
+class Wannier90InputTemplate(ArrayModel):
     """Base model for the input of different versions of `Wannier90`."""
 
     model_config = ConfigDict(validate_assignment=True, extra="forbid")
 
+    # The rendered text of the blocks of this model (see to_str)
+    _render_cache: "_RenderCache" = PrivateAttr(default_factory=lambda: _RenderCache())
+    # The values assigned within batch(), which are validated when it exits
+    _pending: dict[str, Any] | None = PrivateAttr(None)
+
+    # Generated alongside each model from the XML file (see wannier90_input.convert): every
+    # keyword, lower-cased, mapped to its canonical spelling; and the keywords only used by postw90
+    keyword_table: ClassVar[dict[str, str]] = {}
+    postw90_keywords: ClassVar[frozenset[str]] = frozenset()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Assign (and validate) a field, discarding its rendered text."""
+        pending = self._pending
+        if pending is not None and name in type(self).model_fields:
+            pending[name] = self.__dict__[name] = value
+            return
+        super().__setattr__(name, value)
+        self._render_cache.invalidate(name)
+
+    def __copy__(self) -> Self:
+        """Return a shallow copy of the model, with its own cache and outside of any batch."""
+        copied = super().__copy__()
+        # (pydantic copies the private attributes by reference)
+        copied._pending = None
+        copied._render_cache = _RenderCache()
+        return copied
+
+    def update(self, **values: Any) -> None:
+        """Assign several fields at once, validating the model once rather than per field.
+
+        Each value is validated against the type of its field, and then the validators of the
+        model are run on the updated model. If any of them fails, the model is left unchanged.
+        Unlike successive assignments, this allows e.g. replacing ``atoms_cart`` by
+        ``atoms_frac`` (by passing ``atoms_frac=...`` and ``atoms_cart=None``).
+        """
+        if not values:
+            return
+        for name in values:
+            if name not in type(self).model_fields:
+                raise ValueError(f'"{type(self).__name__}" object has no field "{name}"')
+
+        # (kpoints is assigned last, so that kpoints="mp_grid" generates the mesh of the updated
+        # mp_grid)
+        *names, last = sorted(values, key=lambda name: name == "kpoints")
+        previous = dict(self.__dict__), set(self.model_fields_set)
+        try:
+            self.__dict__.update({name: self.validate_field(name, values[name]) for name in names})
+            self.model_fields_set.update(names)
+            # Assigning the last value validates it, and then runs the validators of the model
+            super().__setattr__(last, values[last])
+        except Exception:
+            self._restore(*previous)
+            raise
+        finally:
+            for name in values:
+                self._render_cache.invalidate(name)
+
+    def to_fractional(self, wrap: bool = False) -> Self:
+        """Return a copy of the model with its atoms and projection sites in fractional coordinates.
+
+        The cartesian positions of all of the atoms are converted at once with
+        :func:`~wannier90_input.cell.cartesian_to_fractional`, and so are those of all of the
+        projection sites.
+
+        :param wrap: whether to wrap the positions into the unit cell (as the fractional
+            coordinates of the model must lie within [0, 1])
+        """
+        cell = self.unit_cell_cart  # type: ignore[attr-defined]
+        return self._convert_positions(
+            ("atoms_cart", "atoms_frac"),
+            ("cartesian_site", "fractional_site"),
+            lambda positions: cartesian_to_fractional(cell, positions, wrap),
+        )
+
+    def to_cartesian(self) -> Self:
+        """Return a copy of the model with its atoms and projection sites in cartesian coordinates.
+
+        As with :meth:`to_fractional`, all of the positions are converted at once (to Å).
+        """
+        cell = self.unit_cell_cart  # type: ignore[attr-defined]
+        return self._convert_positions(
+            ("atoms_frac", "atoms_cart"),
+            ("fractional_site", "cartesian_site"),
+            lambda positions: fractional_to_cartesian(cell, positions),
+        )
+
+    def _convert_positions(
+        self,
+        atoms: tuple[str, str],
+        sites: tuple[str, str],
+        convert: Callable[[np.ndarray], np.ndarray],
+    ) -> Self:
+        values: dict[str, Any] = {}
+        source, target = atoms
+        if _is_specified(getattr(self, source, None)):
+            fields = array_fields(type(self))
+            records = fields[source].to_array(getattr(self, source))
+            positions = convert(records["position"])
+            values[target] = fields[target].from_columns(records["symbol"], positions)
+            values[source] = None
+
+        source, target = sites
+        projections = list(getattr(self, "projections", []))
+        indices = [i for i, proj in enumerate(projections) if getattr(proj, source) is not None]
+        if indices:
+            positions = convert(np.array([getattr(projections[i], source) for i in indices]))
+            for i, position in zip(indices, positions.tolist(), strict=True):
+                proj = projections[i]
+                projections[i] = type(proj)(**{**dict(proj), source: None, target: position})
+            values["projections"] = projections
+
+        copy = self.model_copy()
+        copy.update(**values)
+        return copy
+
+    def bvector_shells(self) -> BvectorShells:
+        """Find the shells of b-vectors that Wannier90 would use for the k-point mesh of the model.
+
+        The shells are found from ``unit_cell_cart`` and ``mp_grid`` with ``kmesh_tol``,
+        ``search_shells`` and ``shell_list``, by :func:`~wannier90_input.kmesh.bvector_shells`
+        (which caches them, e.g. for many models of the same structure).
+        """
+        return bvector_shells(
+            self.unit_cell_cart,  # type: ignore[attr-defined]
+            self.mp_grid,  # type: ignore[attr-defined]
+            getattr(self, "kmesh_tol", 1e-6),
+            getattr(self, "search_shells", 36),
+            getattr(self, "shell_list", ()),
+        )
+
+    def check_b1(self) -> None:
+        """Check that the b-vectors of the model satisfy the B1 condition, as Wannier90 does.
+
+        The check is skipped if ``skip_B1_tests`` is set.
+
+        :raises ValueError: if the condition is not satisfied
+        """
+        if getattr(self, "skip_B1_tests", False):
+            return
+        shells = self.bvector_shells()
+        if not shells.b1_satisfied:
+            raise ValueError(
+                f"The b-vectors of the shells {list(shells.shells)} do not satisfy the B1 "
+                f"condition within kmesh_tol; consider changing shell_list or search_shells"
+            )
+
+    def fill_nnkpts(self) -> None:
+        """Set ``nnkpts`` to the neighbours of each k-point along the b-vectors of the model.
+
+        The neighbours are found for ``kpoints`` (or, if there are none, for the Monkhorst-Pack
+        mesh of ``mp_grid``) by :func:`~wannier90_input.kmesh.nnkpts`.
+        """
+        kpoints = getattr(self, "kpoints", [])
+        rows = nnkpts(
+            self.bvector_shells(),
+            self.mp_grid,  # type: ignore[attr-defined]
+            kpoints if len(kpoints) else None,
+        )
+        self.update(nnkpts=rows)
+
+    @contextmanager
+    def batch(self) -> Iterator[Self]:
+        """Defer the validation of the assignments within the context until it exits.
+
+        >>> with inp.batch():  # doctest: +SKIP
+        ...     inp.atoms_cart = None
+        ...     inp.atoms_frac = [...]
+
+        Within the context, the assigned values are stored as they are. On exit, they are
+        validated at once by :meth:`update`; if that fails (or the context raises an exception),
+        all of the assignments are undone.
+        """
+        if self._pending is not None:
+            raise RuntimeError("This model is already being updated in a batch")
+        previous = dict(self.__dict__), set(self.model_fields_set)
+        pending: dict[str, Any] = {}
+        self._pending = pending
+        try:
+            yield self
+        except BaseException:
+            self._restore(*previous)
+            raise
+        finally:
+            self._pending = None
+        self._restore(*previous)
+        self.update(**pending)
+
+    def _restore(self, values: dict[str, Any], fields_set: set[str]) -> None:
+        self.__dict__.clear()
+        self.__dict__.update(values)
+        self.model_fields_set.clear()
+        self.model_fields_set.update(fields_set)
+
     @model_validator(mode="before")
     @classmethod
-    def set_default_num_bands(cls, values: dict[str, Any]) -> dict[str, Any]:
+    def set_default_num_bands(cls, values: Any) -> Any:
         """Set the default num_bands to num_wann if not provided."""
-        if "num_bands" not in values:
-            values["num_bands"] = values["num_wann"]
+        # Anything else (e.g. a missing num_wann) is left for the validation of the fields to report
+        if isinstance(values, dict) and "num_wann" in values:
+            return _set_default_num_bands(values)
         return values
 
+    @field_validator("kpoints", mode="before", check_fields=False)
+    @classmethod
+    def generate_kpoints(cls, value: Any, info: ValidationInfo) -> Any:
+        """Generate the Monkhorst-Pack mesh of mp_grid if kpoints is ``"mp_grid"``.
+
+        The mesh is generated eagerly, when kpoints is validated, rather than when the model is
+        written: the model holds its (N, 3) array (which e.g. ``model_dump()`` expands), shared
+        with the other models of the same grid by the cache of
+        :func:`~wannier90_input.kmesh.monkhorst_pack`.
+        """
+        # (mp_grid is missing from info.data if it is invalid, which its own validation reports)
+        if isinstance(value, str) and value == "mp_grid" and "mp_grid" in info.data:
+            return monkhorst_pack(tuple(info.data["mp_grid"]))
+        return value
+
+    @model_validator(mode="after")
+    def kpoints_match_mp_grid(self) -> Self:
+        """Ensure that there are as many k-points (if any) as points in mp_grid."""
+        kpoints = getattr(self, "kpoints", [])
+        mp_grid = getattr(self, "mp_grid", None)
+        if len(kpoints) and mp_grid is not None and len(kpoints) != prod(mp_grid):
+            raise ValueError(
+                f"There are {len(kpoints)} kpoints, but mp_grid = {' '.join(map(str, mp_grid))} "
+                f"has {prod(mp_grid)} points"
+            )
+        return self
+
     @model_validator(mode="after")
     def atoms_frac_xor_cart(self) -> Self:
         """Ensure that either atoms_frac or atoms_cart is specified, but not both."""
-        if getattr(self, "atoms_frac", None) and getattr(self, "atoms_cart", None):
+        atoms_frac = _is_specified(getattr(self, "atoms_frac", None))
+        atoms_cart = _is_specified(getattr(self, "atoms_cart", None))
+        if atoms_frac and atoms_cart:
             raise ValueError("Specify either atoms_frac or atoms_cart, not both.")
-        if not getattr(self, "atoms_frac", None) and not getattr(self, "atoms_cart", None):
+        if not atoms_frac and not atoms_cart:
             raise ValueError("Specify either atoms_frac or atoms_cart.")
         return self
 
     @classmethod
-    def from_str(cls, string: str) -> "Wannier90InputTemplate":
+    def from_arrays(
+        cls,
+        cell: Any,
+        symbols: Any,
+        positions: Any,
+        *,
+        cartesian: bool = False,
+        units: LengthUnit = "ang",
+        **values: Any,
+    ) -> Self:
+        """Create a model from a unit cell and the symbols and positions of its atoms.
+
+        >>> Wannier90Input.from_arrays(
+        ...     np.eye(3), ["H", "H"], [[0, 0, 0], [0.5, 0.5, 0.5]], num_wann=1
+        ... )  # doctest: +SKIP
+
+        The atoms are stored as one structured array (see :class:`~.parameters.ArrayField`),
+        whose columns are validated at once, rather than as one model per atom.
+
+        :param cell: the (3, 3) lattice vectors of the unit cell
+        :param symbols: the N symbols of the atoms
+        :param positions: the (N, 3) positions of the atoms
+        :param cartesian: whether ``positions`` are cartesian rather than fractional coordinates
+        :param units: the units of ``cell`` (and of cartesian ``positions``), which are converted
+            to Å
+        :param values: the values of the other fields
+        """
+        cell = to_angstrom(cell, units)
+        if cartesian:
+            positions = to_angstrom(positions, units)
+        name = "atoms_cart" if cartesian else "atoms_frac"
+        atoms = array_fields(cls)[name].from_columns(symbols, positions)
+        return cls.model_validate({"unit_cell_cart": cell, name: atoms, **values})
+
+    @classmethod
+    def from_trusted(cls, **values: Any) -> Self:
+        """Construct a model from values that are known to be valid, without validating them.
+
+        This is much faster than validating the values, but they must already have the types of
+        the fields (e.g. ``AtomFrac`` rather than ``dict``), as with
+        :meth:`~pydantic.BaseModel.model_construct`. The default of ``num_bands`` is still set,
+        and missing required fields are still reported.
+        See :class:`wannier90_input.bulk.TrustedConstructor` to validate a sample of the models.
+        """
+        defaults, factories, required = _construct_defaults(cls)
+        if not required <= values.keys():
+            missing = ", ".join(sorted(required - values.keys()))
+            raise ValueError(f"Missing values for the required fields {missing}")
+        values = _set_default_num_bands(values)
+
+        fields = dict(defaults)
+        for name, factory in factories.items():
+            fields[name] = factory()
+        fields.update(values)
+        # Set up the instance as model_construct does, which is much slower as it looks up the
+        # default of each field on every call
+        model = cls.__new__(cls)
+        object.__setattr__(model, "__dict__", fields)
+        object.__setattr__(model, "__pydantic_fields_set__", set(values))
+        object.__setattr__(model, "__pydantic_extra__", None)
+        model.model_post_init(None)
+        return model
+
+    @classmethod
+    def validate_many(cls, data: Sequence[Any] | str | bytes) -> list["ValidationResult"]:
+        """Validate a list of inputs (or a JSON array of them) at once, item by item.
+
+        The whole list is validated in a single call to pydantic-core (and a JSON array is
+        validated without first being loaded as Python objects). If any of the items is invalid,
+        the errors of each item are collected separately, and the valid items still validated.
+        """
+        adapter = _list_adapter(cls)
+        try:
+            if isinstance(data, str | bytes):
+                return [ValidationResult(model, None) for model in adapter.validate_json(data)]
+            return [ValidationResult(model, None) for model in adapter.validate_python(data)]
+        except ValidationError as error:
+            failed = {details["loc"][0] for details in error.errors() if details["loc"]}
+            if not failed:
+                raise
+
+        items = from_json(data) if isinstance(data, str | bytes) else data
+        valid = iter(adapter.validate_python([x for i, x in enumerate(items) if i not in failed]))
+        results = []
+        for i, item in enumerate(items):
+            if i not in failed:
+                results.append(ValidationResult(next(valid), None))
+                continue
+            # Validate the invalid items on their own, for their errors to refer to them alone
+            try:
+                results.append(ValidationResult(cls.model_validate(item), None))
+            except ValidationError as item_error:
+                results.append(ValidationResult(None, item_error))
+        return results
+
+    @classmethod
+    def from_str(cls, string: str) -> Self:
         """Convert a string to a Wannier90Input Model instance."""
-        raise NotImplementedError()
+        return cls.model_validate(parse_lines(string.splitlines(), cls))
+
+    @classmethod
+    def from_file(cls, source: Source) -> Self:
+        """Read a Wannier90Input Model instance from a ``.win`` file (a path or a file object).
+
+        The file is streamed line by line, so it is never held in memory as a whole.
+        """
+        return cls.model_validate(parse_lines(iter_lines(source), cls))
+
+    @classmethod
+    def open(cls, path: str | os.PathLike[str]) -> LazyWinFile:
+        """Open a ``.win`` file without parsing its blocks until they are accessed.
+
+        >>> with Wannier90Input.open("silicon.win") as win:  # doctest: +SKIP
+        ...     num_wann = win["num_wann"]
+        """
+        return LazyWinFile(path, cls)
+
+    @classmethod
+    def validate_field(cls, name: str, value: Any) -> Any:
+        """Validate ``value`` against the type of the field ``name``, independently of the rest."""
+        return _field_adapter(cls, name).validate_python(value)
 
     def __str__(self) -> str:
         """Return the model formatted as Wannier90 expects it."""
-        # Iterate over the fields
-        lines: list[str] = []
-        for name, field in self.model_fields.items():
+        return self.to_str()
+
+    def to_str(self, precision: int | None = None) -> str:
+        """Return the model formatted as Wannier90 expects it.
+
+        The rendered text of each block is kept, and reused until a new value is assigned to
+        that block. Modifying the items of a block in place is not detected (adding or removing
+        items is): assign the modified block to its field instead.
+
+        :param precision: the number of decimal places with which to write the floating-point
+            numbers in the numeric blocks (``unit_cell_cart``, ``atoms_frac``, ``atoms_cart`` and
+            ``kpoints``); by default they are written exactly as ``str`` writes them
+        """
+        return "\n".join(self._iter_lines(precision, store=True))
+
+    def iter_lines(self, precision: int | None = None) -> Iterator[str]:
+        """Yield the lines of :meth:`to_str` (without their newline characters) one by one.
+
+        The rows of the numeric blocks are yielded in chunks of up to a few thousand lines,
+        joined by newlines, so that the text of a large block is never held in memory at once.
+        """
+        return _collapse_blank_lines(self._iter_field_lines(precision, store=False))
+
+    def _iter_lines(self, precision: int | None, store: bool) -> Iterator[str]:
+        return _collapse_blank_lines(self._iter_field_lines(precision, store))
+
+    def _iter_field_lines(self, precision: int | None, store: bool) -> Iterator[str]:
+        """Yield the lines of each field, reusing (and if ``store``, keeping) rendered blocks."""
+        plan = _render_plan(type(self))
+        # Only visit the fields that can differ from their defaults: those that have been set,
+        # those that are required, and containers that may have been modified in place
+        names = sorted(self.model_fields_set | plan.always, key=plan.order.__getitem__)
+        for name in names:
+            step = plan.steps[name]
+            value = getattr(self, name, None)
             # Only print non-default values
-            if not field.is_required() and getattr(self, name, None) == field.default:
+            if not step.required and _is_default(value, step.default):
                 continue
+            lines: Iterable[str] | None = None
+            if step.block:
+                lines = self._render_cache.lookup(name, precision, value)
+            if lines is None:
+                lines = step.write(name, self, precision)
+                # (the text of a memory-mapped block would hold all of its data in memory)
+                if store and step.block and not isinstance(value, np.memmap):
+                    lines = self._render_cache.store(name, precision, value, lines)
+            yield from lines
+
+    def write_to(
+        self, target: str | os.PathLike[str] | IO[str], precision: int | None = None
+    ) -> None:
+        """Write the model to a ``.win`` file (a path or a file object), as :meth:`to_str` would.
+
+        The text is streamed to the file, so it is never held in memory as a whole.
+        """
+        if not isinstance(target, str | os.PathLike):
+            _write_lines(target, self.iter_lines(precision))
+            return
+        with open(target, "w", newline="") as f:
+            _write_lines(f, self.iter_lines(precision))
+
+    def compile(self, *slots: str, precision: int | None = None) -> "CompiledInput":
+        """Render the model once, leaving the fields ``slots`` to be filled in later.
+
+        >>> template = inp.compile("num_iter", "dis_win_max")  # doctest: +SKIP
+        >>> text = template.render(num_iter=500, dis_win_max=12.5)  # doctest: +SKIP
+        """
+        return CompiledInput(self, slots, precision)
+
+
+@cache
+def _construct_defaults(
+    model: type[BaseModel],
+) -> tuple[dict[str, Any], dict[str, Callable[[], Any]], frozenset[str]]:
+    """Return the default values of the fields of ``model``, their factories and required fields.
+
+    The default values are returned for every field, in order (with the required fields and the
+    fields that have factories mapped to None), to be updated.
+    """
+    defaults, factories = {}, {}
+    for name, field in model.model_fields.items():
+        defaults[name] = None if field.is_required() else field.default
+        if field.default_factory is not None:
+            defaults[name] = None
+            factories[name] = field.default_factory
+    required = frozenset(name for name, field in model.model_fields.items() if field.is_required())
+    return defaults, factories, required  # type: ignore[return-value]
+
+
+def _set_default_num_bands(values: dict[str, Any]) -> dict[str, Any]:
+    if "num_bands" not in values:
+        values["num_bands"] = values["num_wann"]
+    return values
+
+
+def _is_specified(value: Any) -> bool:
+    return value is not None and len(value) > 0
+
+
+def _is_default(value: Any, default: Any) -> bool:
+    # (comparing an array with the default, which is never an array, would be elementwise)
+    return not isinstance(value, np.ndarray) and value == default
+
 
-            if name in [
-                "projections",
-                "unit_cell_cart",
-                "atoms_frac",
-                "atoms_cart",
-                "dis_spheres",
-                "shell_list",
-                "kpoints",
-                "nnkpts",
-                "select_projections",
-                "slwf_centres",
-                "wannier_plot_list",
-                "kpoint_path",
-                "bands_plot_project",
-            ]:
-                if name in ["unit_cell_cart"]:
-                    units = "ang"
-                else:
-                    units = None
-                if name in ["projections"]:
-                    to_remove = ""
-                else:
-                    to_remove = "[],"
-                lines += _block_str(name, self, units, to_remove)
-            elif name in ["mp_grid"]:
-                lines += _list_keyword_str(name, self)
-            elif name in ["exclude_bands"]:
-                lines += _list_keyword_str(name, self, join_with=",")
+class ValidationResult(NamedTuple):
+    """The outcome of validating one item of a batch: either a model or its errors."""
+
+    model: Wannier90InputTemplate | None
+    error: ValidationError | None
+
+
+@cache
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+class CompiledInput:
+    """A rendered model in which the values of some of its fields (the slots) can be changed.
+
+    :meth:`render` validates the value of each slot on its own and splices it into the text
+    rendered when the model was compiled, giving the same text as rendering
+    ``model.model_copy(update=values)``. As with :meth:`~pydantic.BaseModel.model_copy`, the
+    validators that relate several fields (e.g. the default of ``num_bands``) are not run.
+    """
+
+    def __init__(
+        self, model: Wannier90InputTemplate, slots: Iterable[str], precision: int | None = None
+    ):
+        """Compile ``model``, with the fields ``slots`` left to be filled in."""
+        self.model_type = type(model)
+        self.precision = precision
+        self._plan = _render_plan(self.model_type)
+        self.slots = tuple(slots)
+        for name in self.slots:
+            if name not in self._plan.steps:
+                raise ValueError(f"`{name}` is not a field of {self.model_type.__name__}")
+
+        # The text is a sequence of chunks of static text, interleaved with slots
+        self._parts: list[_Chunk | str] = []
+        self._values: dict[str, _Chunk] = {}
+        lines: list[str] = []
+        names = model.model_fields_set | self._plan.always | set(self.slots)
+        for name in sorted(names, key=self._plan.order.__getitem__):
+            if name in self.slots:
+                self._parts += [_chunk(lines), name]
+                self._values[name] = self._render(name, getattr(model, name))
+                lines = []
             else:
-                lines += _keyword_str(name, self)
+                lines += self._render_lines(name, model)
+        self._parts.append(_chunk(lines))
+
+    def render(self, **values: Any) -> str:
+        """Return the text of the model with the given values of (some of) its slots."""
+        chunks = dict(self._values)
+        for name, value in values.items():
+            if name not in chunks:
+                raise ValueError(f"`{name}` is not a slot of this template")
+            chunks[name] = self._render(name, self.model_type.validate_field(name, value))
+
+        text: list[str] = []
+        blank = False
+        for part in self._parts:
+            chunk = chunks[part] if isinstance(part, str) else part
+            if not chunk.text:
+                blank = blank or chunk.lead
+                continue
+            if text:
+                text.append("\n\n" if blank or chunk.lead else "\n")
+            text.append(chunk.text)
+            blank = chunk.trail
+        return "".join(text)
+
+    def _render(self, name: str, value: Any) -> "_Chunk":
+        return _chunk(self._render_lines(name, SimpleNamespace(**{name: value})))
+
+    def _render_lines(self, name: str, model: Any) -> Iterable[str]:
+        step = self._plan.steps[name]
+        value = getattr(model, name, None)
+        if not step.required and _is_default(value, step.default):
+            return []
+        return step.write(name, model, self.precision)
+
+
+class _Chunk(NamedTuple):
+    """Rendered lines, joined with any runs of blank lines collapsed into one."""
+
+    text: str  # without blank lines at the start or the end
+    lead: bool  # whether the lines start with a blank line (or are all blank)
+    trail: bool  # whether the lines end with a blank line
+
+
+def _chunk(lines: Iterable[str]) -> _Chunk:
+    lines = list(lines)
+    lead = bool(lines) and not lines[0]
+    trail = bool(lines) and not lines[-1]
+    return _Chunk("\n".join(_collapse_blank_lines(lines)), lead, trail)
+
 
-        return "\n".join(lines).replace("\n\n\n", "\n\n").strip("\n")
+def _collapse_blank_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Collapse runs of blank lines into one, and drop those at the start and the end."""
+    started = blank = False
+    for line in lines:
+        if not line:
+            blank = started
+            continue
+        if blank:
+            yield ""
+            blank = False
+        started = True
+        yield line
+
+
+def _write_lines(f: IO[str], lines: Iterable[str]) -> None:
+    first = True
+    for line in lines:
+        if not first:
+            f.write("\n")
+        f.write(line)
+        first = False
 
 
 indent = " "
 
 
+@cache
+def _field_adapter(model: type[BaseModel], name: str) -> TypeAdapter[Any]:
+    field = model.model_fields[name]
+    return TypeAdapter(Annotated[field.annotation, field])  # type: ignore[arg-type]
+
+
+# A writer is passed the name of a field, an object holding its value and the precision
+_Writer = Callable[[str, Any, int | None], Iterable[str]]
+
+
+class _RenderStep(NamedTuple):
+    """How to render one field of a model."""
+
+    write: _Writer
+    default: Any
+    required: bool
+    block: bool
+
+
+class _RenderPlan(NamedTuple):
+    """How to render each field of a model, computed once per model class."""
+
+    order: dict[str, int]
+    steps: dict[str, _RenderStep]
+    always: frozenset[str]
+
+
+class _RenderCache(dict[tuple[str, int | None], tuple[Any, int, tuple[str, ...]]]):
+    """The rendered lines of the blocks of a model, by field name and precision.
+
+    Each entry records the value it was rendered from, and is only reused while the field still
+    holds that same object with the same number of items. The cache never affects the value of
+    a model, so caches always compare equal, and are neither pickled nor copied (see
+    ``__copy__``).
+    """
+
+    def lookup(self, name: str, precision: int | None, value: Any) -> tuple[str, ...] | None:
+        """Return the rendered lines of ``value``, if they are cached."""
+        entry = self.get((name, precision))
+        if entry is None or entry[0] is not value or entry[1] != len(value):
+            return None
+        return entry[2]
+
+    def store(
+        self, name: str, precision: int | None, value: Any, lines: Iterable[str]
+    ) -> tuple[str, ...]:
+        """Cache (and return) the rendered lines of ``value``."""
+        self[name, precision] = (value, len(value), tuple(lines))
+        return self[name, precision][2]
+
+    def invalidate(self, name: str) -> None:
+        """Discard the rendered lines of the field ``name``."""
+        for key in [key for key in self if key[0] == name]:
+            del self[key]
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _RenderCache)
+
+    __hash__ = None
+
+    def __reduce__(self) -> tuple[type["_RenderCache"], tuple[()]]:
+        return _RenderCache, ()
+
+
+_blocks = frozenset(
+    [
+        "projections",
+        "unit_cell_cart",
+        "atoms_frac",
+        "atoms_cart",
+        "dis_spheres",
+        "shell_list",
+        "kpoints",
+        "nnkpts",
+        "slwf_centres",
+        "kpoint_path",
+    ]
+)
+
+
+@cache
+def _render_plan(model: type[BaseModel]) -> _RenderPlan:
+    steps = {
+        name: _RenderStep(_writer(name), field.default, field.is_required(), name in _blocks)
+        for name, field in model.model_fields.items()
+    }
+    always = frozenset(
+        name
+        for name, field in model.model_fields.items()
+        if field.is_required() or field.default_factory is not None
+    )
+    return _RenderPlan({name: i for i, name in enumerate(steps)}, steps, always)
+
+
+def _writer(name: str) -> _Writer:
+    """Choose the function that renders the field ``name``."""
+    if name in _blocks:
+        units = "ang" if name == "unit_cell_cart" else None
+        if name in _numeric_blocks:
+            return lambda name, model, precision: _numeric_block_str(name, model, units, precision)
+        to_remove = "" if name == "projections" else "[],"
+        return lambda name, model, precision: _block_str(name, model, units, to_remove)
+    if name == "mp_grid":
+        return lambda name, model, precision: _list_keyword_str(name, model)
+    if name in _index_keywords:
+        return lambda name, model, precision: _index_keyword_str(name, model)
+    return lambda name, model, precision: _keyword_str(name, model)
+
+
+# The keywords whose values are sets of indices (see IndexRanges), written as e.g. "1-40,45"
+_index_keywords = frozenset(
+    ["exclude_bands", "select_projections", "wannier_plot_list", "bands_plot_project"]
+)
+
+
 def _sanitize(string: str, to_remove: str) -> str:
     for char in to_remove:
         string = string.replace(char, "")
@@ -87,25 +760,118 @@ def _sanitize(string: str, to_remove: str) -> str:
 
 def _block_str(
     name: str, model: BaseModel, units: str | None = None, to_remove: str = ",[]"
-) -> list[str]:
+) -> Iterator[str]:
     content = getattr(model, name)
     # Only print non-empty blocks
     if content == []:
-        return []
-    unit_list = [indent + units] if units else []
-
-    return (
-        ["", f"begin {name}"]
-        + unit_list
-        + [indent + _sanitize(str(x), to_remove) for x in content]
-        + [f"end {name}", ""]
-    )
+        return
+    yield from ["", f"begin {name}"]
+    if units:
+        yield indent + units
+    for x in content:
+        yield indent + _sanitize(str(x), to_remove)
+    yield from [f"end {name}", ""]
+
+
+def _numeric_block_str(
+    name: str, model: BaseModel, units: str | None = None, precision: int | None = None
+) -> Iterator[str]:
+    """Format a block of numbers with one printf-style operation per chunk of its rows.
+
+    This produces the same text as :func:`_block_str` (``%r`` formats a float exactly as ``str``
+    does) but avoids converting each row to a string and sanitizing it separately.
+    """
+    content = getattr(model, name)
+    # Only print non-empty blocks
+    if content is None or len(content) == 0:
+        return
+    yield from ["", f"begin {name}"]
+    if units:
+        yield indent + units
+
+    flatten, columns = _numeric_blocks[name]
+    float_format = "%r" if precision is None else f"%.{precision}f"
+    row_format = indent + " ".join(float_format if c == "f" else "%" + c for c in columns)
+    chunk_format = "\n".join([row_format] * _chunk_rows)
+    for start in range(0, len(content), _chunk_rows):
+        rows = content[start : start + _chunk_rows]
+        if len(rows) < _chunk_rows:
+            chunk_format = "\n".join([row_format] * len(rows))
+        if isinstance(rows, np.ndarray):
+            # (tolist converts the elements to Python numbers, which %r formats as str does)
+            yield chunk_format % tuple(_flatten_array(rows))
+        else:
+            yield chunk_format % tuple(flatten(rows))
+
+    yield from [f"end {name}", ""]
+
+
+# The number of rows of a numeric block that are formatted at once
+_chunk_rows = 4096
+
+
+def _flatten_array(rows: np.ndarray) -> list[Any]:
+    if rows.dtype.names is None:
+        return rows.ravel().tolist()
+    # The values of each record, field after field
+    columns = [rows[name].reshape(len(rows), -1).tolist() for name in rows.dtype.names]
+    return list(chain.from_iterable(chain.from_iterable(zip(*columns, strict=True))))
+
+
+def _flatten_rows(rows: list[list[float]]) -> Iterable[float]:
+    return chain.from_iterable(rows)
+
+
+def _flatten_atoms(atoms: list[AtomFrac] | list[AtomCart]) -> Iterable[str | float]:
+    for atom in atoms:
+        yield atom.symbol
+        position = atom.position
+        yield from position.tolist() if isinstance(position, np.ndarray) else position
+
+
+def _flatten_spheres(spheres: list[DisentanglementSphere]) -> Iterable[float]:
+    for sphere in spheres:
+        center = sphere.center
+        yield from center.tolist() if isinstance(center, np.ndarray) else center
+        yield sphere.radius
+
+
+def _flatten_centres(centres: list[CentreConstraint]) -> Iterable[int | float]:
+    for centre in centres:
+        yield centre.number
+        center = centre.center
+        yield from center.tolist() if isinstance(center, np.ndarray) else center
+
+
+def _flatten_nnkpts(nnkpts: list[NearestNeighborKpoint]) -> Iterable[int]:
+    for nnkpt in nnkpts:
+        yield nnkpt.kpoint_number
+        yield nnkpt.neighbor_kpoint_number
+        yield from nnkpt.reciprocal_lattice_vector
+
+
+# For each numeric block: how to flatten its rows into a sequence of values, and the type of
+# each column ("f" for floats, otherwise a printf conversion)
+_numeric_blocks: dict[str, tuple[Callable[[Any], Iterable[Any]], str]] = {
+    "unit_cell_cart": (_flatten_rows, "fff"),
+    "atoms_frac": (_flatten_atoms, "sfff"),
+    "atoms_cart": (_flatten_atoms, "sfff"),
+    "kpoints": (_flatten_rows, "fff"),
+    "nnkpts": (_flatten_nnkpts, "ddddd"),
+    "dis_spheres": (_flatten_spheres, "ffff"),
+    "slwf_centres": (_flatten_centres, "dfff"),
+}
 
 
 def _keyword_str(name: str, model: BaseModel) -> list[str]:
     return [f"{name} = {getattr(model, name)}"] if getattr(model, name) is not None else []
 
 
+def _index_keyword_str(name: str, model: BaseModel) -> list[str]:
+    value = getattr(model, name)
+    return [f"{name} = {IndexRanges(value) if isinstance(value, list) else value}"] if value else []
+
+
 def _list_keyword_str(name: str, model: BaseModel, join_with: str = " ") -> list[str]:
     value = getattr(model, name)
     if not isinstance(value, list | tuple):
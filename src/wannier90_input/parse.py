@@ -0,0 +1,520 @@
+"""Functions for parsing `Wannier90` input (``.win``) files.
+
+Files are read in a single pass: each line is stripped of comments and tokenized into either a
+``keyword = value`` pair or a row of a ``begin ... end`` block. The tokens are then converted to
+the keyword arguments expected by the generated ``Wannier90Input`` models.
+"""
+
+import difflib
+import mmap
+import os
+import re
+import warnings
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from functools import cache
+from itertools import chain
+from types import UnionType
+from typing import IO, TYPE_CHECKING, Annotated, Any, Literal, Union, get_args, get_origin
+
+from typing_extensions import Self
+
+from wannier90_input.models.parameters import Projection
+
+if TYPE_CHECKING:
+    from wannier90_input.models.template import Wannier90InputTemplate
+
+Source = str | os.PathLike[str] | IO[str]
+Token = tuple[str, str | list[str]]
+
+BOHR_TO_ANG = 0.52917721092
+
+_keyword_line = re.compile(r"([^\s=:]+)\s*[=:]?\s*(.*)")
+_block_delimiter = re.compile(r"(begin|end)(?:\s*[=:]\s*|\s+)(\w+)$", re.IGNORECASE)
+# Block delimiters in raw bytes; the pattern starts with a literal newline (rather than using
+# re.MULTILINE) so that the regex engine can skip quickly through the rows of large blocks
+_block_delimiter_bytes_body = (
+    rb"[ \t]*(?i:(begin|end))(?:[ \t]*[=:][ \t]*|[ \t]+)(\w+)[ \t]*(?:[!#][^\n]*)?\r?(?=\n|$)"
+)
+_first_block_delimiter_bytes = re.compile(_block_delimiter_bytes_body)
+_block_delimiter_bytes = re.compile(rb"\n" + _block_delimiter_bytes_body)
+_fortran_exponent = str.maketrans("dD", "ee")
+_fortran_logicals = {
+    "t": True,
+    "true": True,
+    ".true.": True,
+    "f": False,
+    "false": False,
+    ".false.": False,
+}
+
+
+class InvalidWinSyntaxError(ValueError):
+    """Raised when the content of a ``.win`` file cannot be tokenized."""
+
+
+class UnknownKeywordError(InvalidWinSyntaxError):
+    """Raised when a ``.win`` file contains a keyword that Wannier90 does not recognise."""
+
+
+def iter_lines(source: Source) -> Iterator[str]:
+    """Iterate over the lines of a ``.win`` file, given either its path or an open file object."""
+    if isinstance(source, str | os.PathLike):
+        with open(source) as f:
+            yield from f
+    else:
+        yield from source
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Token]:
+    """Tokenize the lines of a ``.win`` file.
+
+    Yields ``(keyword, value)`` for keyword lines and ``(block_name, rows)`` for ``begin ... end``
+    blocks. Keywords and block names are lower-cased; comments and blank lines are dropped.
+    """
+    block: str | None = None
+    rows: list[str] = []
+    for number, raw_line in enumerate(lines, start=1):
+        line = _strip_comment(raw_line) if "!" in raw_line or "#" in raw_line else raw_line.strip()
+        if not line:
+            continue
+
+        delimiter = _match_block_delimiter(line) if line[0] in "bBeE" else None
+        if delimiter is None:
+            if block is None:
+                key, value = _split_keyword_line(line, number)
+                yield key.lower(), value
+            else:
+                rows.append(line)
+        elif delimiter[0] == "begin":
+            if block is not None:
+                raise InvalidWinSyntaxError(
+                    f"Line {number}: `begin {delimiter[1]}` found inside the `{block}` block"
+                )
+            block, rows = delimiter[1], []
+        elif delimiter[1] != block:
+            raise InvalidWinSyntaxError(
+                f"Line {number}: `end {delimiter[1]}` does not close an open block"
+            )
+        else:
+            yield block, rows
+            block = None
+
+    if block is not None:
+        raise InvalidWinSyntaxError(f"The `{block}` block is never closed")
+
+
+def parse_lines(lines: Iterable[str], model: type["Wannier90InputTemplate"]) -> dict[str, Any]:
+    """Convert the lines of a ``.win`` file to keyword arguments for ``model``.
+
+    Keywords that are only read by `postw90` are dropped with a warning.
+    """
+    converters = _converters(model)
+    kwargs: dict[str, Any] = {}
+    ignored: list[str] = []
+    for key, value in tokenize(lines):
+        name, converted = _convert(converters, key, value)
+        if name in kwargs or name in ignored:
+            raise InvalidWinSyntaxError(f"`{name}` is specified more than once")
+        if name in model.postw90_keywords:
+            ignored.append(name)
+        else:
+            kwargs[name] = converted
+    if ignored:
+        warnings.warn(
+            f"Ignoring keywords that are only used by postw90: {', '.join(ignored)}", stacklevel=3
+        )
+    return kwargs
+
+
+def parse_value(model: type["Wannier90InputTemplate"], name: str, raw: str | list[str]) -> Any:
+    """Convert and validate the raw value of a single keyword (or the rows of a block)."""
+    _, value = _convert(_converters(model), name.lower(), raw)
+    if name in model.model_fields:
+        value = model.validate_field(name, value)
+    return value
+
+
+def peek(path: str | os.PathLike[str], keywords: Iterable[str]) -> dict[str, str]:
+    """Find the raw values of the given (non-block) keywords in a ``.win`` file.
+
+    Only keyword lines are tokenized: the rows of ``begin ... end`` blocks are skipped unread, and
+    the file is closed as soon as all of the requested keywords have been found. Keywords are
+    matched case-insensitively and returned lower-cased.
+
+    :raises InvalidWinSyntaxError: if a line before the last keyword found cannot be read
+    """
+    wanted = {keyword.lower() for keyword in keywords}
+    found: dict[str, str] = {}
+    if not wanted:
+        return found
+    in_block = False
+    with open(path, "rb") as f:
+        for number, raw_line in enumerate(f, start=1):
+            head = raw_line.lstrip()[:5].lower()
+            if in_block:
+                in_block = not (
+                    head[:3] == b"end" and _match_block_delimiter(_decode(raw_line, number))
+                )
+                continue
+            if head == b"begin":
+                in_block = _match_block_delimiter(_decode(raw_line, number)) is not None
+                if in_block:
+                    continue
+            line = _decode(raw_line, number)
+            if not line:
+                continue
+            key, value = _split_keyword_line(line, number)
+            key = key.lower()
+            if key in wanted:
+                found[key] = value
+                if len(found) == len(wanted):
+                    break
+    return found
+
+
+class LazyWinFile(Mapping[str, Any]):
+    """A memory-mapped ``.win`` file whose keywords and blocks are only parsed when accessed.
+
+    Opening the file records the byte range of every ``begin ... end`` block without tokenizing
+    its rows; only the (short) keyword lines in between are tokenized. Looking up a keyword
+    converts and validates that one field, so e.g. reading ``num_wann`` from a file with a dense
+    ``kpoints`` block never touches the k-points.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], model: type["Wannier90InputTemplate"]):
+        """Memory-map the file at ``path`` and locate its keywords and blocks."""
+        self.model = model
+        self._converters = _converters(model)
+        self._data: mmap.mmap | bytes
+        with open(path, "rb") as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be memory-mapped
+                self._data = b""
+        self._keywords: dict[str, str] = {}
+        # The byte range of the rows of each block, keyed by field name
+        self.block_ranges: dict[str, tuple[int, int]] = {}
+        self._values: dict[str, Any] = {}
+        self._scan()
+
+    def _scan(self) -> None:
+        start = 0
+        block: bytes | None = None
+        first = _first_block_delimiter_bytes.match(self._data)
+        matches = _block_delimiter_bytes.finditer(self._data)
+        for match in chain([first] if first else [], matches):
+            delimiter, name = match.group(1).lower(), match.group(2).lower()
+            if delimiter == b"begin":
+                if block is not None:
+                    raise InvalidWinSyntaxError(
+                        f"`begin {name.decode()}` found inside the `{block.decode()}` block"
+                    )
+                self._add_keywords(start, match.start())
+                block, start = name, match.end()
+            elif name != block:
+                raise InvalidWinSyntaxError(f"`end {name.decode()}` does not close an open block")
+            else:
+                self._add(name.decode(), self.block_ranges, (start, match.start()))
+                block, start = None, match.end()
+        if block is not None:
+            raise InvalidWinSyntaxError(f"The `{block.decode()}` block is never closed")
+        self._add_keywords(start, len(self._data))
+
+    def _add_keywords(self, start: int, stop: int) -> None:
+        lines = self._data[start:stop].decode().splitlines()
+        for key, value in tokenize(lines):
+            self._add(key, self._keywords, value)
+
+    def _add(self, key: str, store: dict[str, Any], value: Any) -> None:
+        name = _canonical_name(self._converters, key)
+        if name in self._keywords or name in self.block_ranges:
+            raise InvalidWinSyntaxError(f"`{name}` is specified more than once")
+        store[name] = value
+
+    def _raw(self, name: str) -> str | list[str]:
+        if name in self.block_ranges:
+            start, stop = self.block_ranges[name]
+            text = self._data[start:stop].decode()
+            return [line for line in map(_strip_comment, text.splitlines()) if line]
+        return self._keywords[name]
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._values:
+            if name not in self._keywords and name not in self.block_ranges:
+                raise KeyError(name)
+            self._values[name] = parse_value(self.model, name, self._raw(name))
+        return self._values[name]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._keywords
+        yield from self.block_ranges
+
+    def __len__(self) -> int:
+        return len(self._keywords) + len(self.block_ranges)
+
+    def to_model(self) -> "Wannier90InputTemplate":
+        """Parse every keyword and block (bar those only used by postw90), returning the model."""
+        kwargs = {
+            name: _convert(self._converters, name.lower(), self._raw(name))[1]
+            for name in self
+            if name not in self.model.postw90_keywords
+        }
+        return self.model.model_validate(kwargs)
+
+    def close(self) -> None:
+        """Release the memory map."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+def _convert(
+    converters: dict[str, tuple[str, Callable[[Any], Any]]], key: str, value: str | list[str]
+) -> tuple[str, Any]:
+    """Return the canonical name of ``key`` and its value converted for validation."""
+    name = _canonical_name(converters, key)
+    convert = converters[key][1]
+    if isinstance(value, list) != (name in _block_parsers):
+        # e.g. a block that has been provided as a keyword; leave it to the model to complain
+        return name, value
+    return name, convert(value)
+
+
+def _canonical_name(converters: dict[str, tuple[str, Callable[[Any], Any]]], key: str) -> str:
+    entry = converters.get(key)
+    if entry is None:
+        message = f"`{key}` is not a Wannier90 keyword"
+        suggestions = difflib.get_close_matches(key, converters, n=1)
+        if suggestions:
+            message += f"; did you mean `{converters[suggestions[0]][0]}`?"
+        raise UnknownKeywordError(message)
+    return entry[0]
+
+
+def _match_block_delimiter(line: str) -> tuple[str, str] | None:
+    """Return e.g. ``("begin", "kpoints")`` if ``line`` opens or closes a block."""
+    first = line[:5].lower()
+    if first != "begin" and first[:3] != "end":
+        return None
+    match = _block_delimiter.match(line)
+    if match is None:
+        return None
+    return match.group(1).lower(), match.group(2).lower()
+
+
+def _split_keyword_line(line: str, number: int) -> tuple[str, str]:
+    """Return the keyword and the (raw) value of the (stripped) line ``number``."""
+    match = _keyword_line.match(line)
+    if match is None:
+        raise InvalidWinSyntaxError(f"Line {number}: `{line}` does not start with a keyword")
+    key, value = match.groups()
+    return key, value
+
+
+def _decode(raw_line: bytes, number: int) -> str:
+    """Decode the line ``number`` of a file read in binary mode, stripped of its comment."""
+    try:
+        return _strip_comment(raw_line.decode())
+    except UnicodeDecodeError as err:
+        raise InvalidWinSyntaxError(f"Line {number}: {err}") from err
+
+
+def _strip_comment(line: str) -> str:
+    for char in "!#":
+        index = line.find(char)
+        if index >= 0:
+            line = line[:index]
+    return line.strip()
+
+
+@cache
+def _converters(
+    model: type["Wannier90InputTemplate"],
+) -> dict[str, tuple[str, Callable[[Any], Any]]]:
+    """Map lower-cased keywords to their canonical name and a function to convert their value."""
+    table = model.keyword_table or {name.lower(): name for name in model.model_fields}
+    converters: dict[str, tuple[str, Callable[[Any], Any]]] = {}
+    for key, name in table.items():
+        if name in _block_parsers:
+            converters[key] = (name, _block_parsers[name])
+        elif name in model.model_fields:
+            converters[key] = (name, _keyword_converter(model.model_fields[name].annotation))
+        else:
+            # e.g. postw90 keywords, which are kept as raw strings
+            converters[key] = (name, _identity)
+    return converters
+
+
+def _unwrap(annotation: Any) -> Any:
+    """Strip ``Annotated`` and ``Optional`` wrappers from a type annotation."""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _unwrap(get_args(annotation)[0])
+    if origin is Union or origin is UnionType:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return _unwrap(args[0])
+    return annotation
+
+
+def _keyword_converter(annotation: Any) -> Callable[[str], Any]:
+    annotation = _unwrap(annotation)
+    origin = get_origin(annotation)
+    if annotation is bool:
+        return _to_bool
+    if annotation is float:
+        return _to_float
+    if origin is Literal:
+        choices = {str(c).lower(): c for c in get_args(annotation) if c is not None}
+        return lambda value: choices.get(value.lower(), value)
+    if origin is list or origin is tuple:
+        if _unwrap(get_args(annotation)[0]) is int:
+            return _to_int_list
+        return _to_float_list
+    return _identity
+
+
+def _identity(value: str) -> str:
+    return value
+
+
+def _to_bool(value: str) -> bool | str:
+    return _fortran_logicals.get(value.lower(), value)
+
+
+def _to_float(value: str) -> str:
+    return value.translate(_fortran_exponent)
+
+
+def _to_float_list(value: str) -> list[str]:
+    return value.translate(_fortran_exponent).replace(",", " ").split()
+
+
+def _to_int_list(value: str) -> list[int | str]:
+    """Convert e.g. ``"1-3, 7"`` to ``[1, 2, 3, 7]``."""
+    integers: list[int | str] = []
+    for item in value.replace(",", " ").split():
+        start, sep, stop = item.partition("-")
+        if sep and start.isdigit() and stop.isdigit():
+            integers.extend(range(int(start), int(stop) + 1))
+        else:
+            integers.append(item)
+    return integers
+
+
+def _split_units(rows: list[str]) -> tuple[float, list[str]]:
+    """Remove an optional leading units line from a block, returning the scale factor to Å."""
+    if rows:
+        first = rows[0].lower()
+        if first in ("ang", "angstrom"):
+            return 1.0, rows[1:]
+        if first == "bohr":
+            return BOHR_TO_ANG, rows[1:]
+    return 1.0, rows
+
+
+def _floats(row: str) -> list[float]:
+    return [float(x) for x in row.translate(_fortran_exponent).split()]
+
+
+def _parse_unit_cell_cart(rows: list[str]) -> list[list[float]]:
+    scale, rows = _split_units(rows)
+    return [[scale * x for x in _floats(row)] for row in rows]
+
+
+def _parse_atoms_frac(rows: list[str]) -> list[dict[str, Any]]:
+    atoms = []
+    for row in rows:
+        symbol, position = row.split(maxsplit=1)
+        atoms.append({"symbol": symbol, "position": _to_float_list(position)})
+    return atoms
+
+
+def _parse_atoms_cart(rows: list[str]) -> list[dict[str, Any]]:
+    scale, rows = _split_units(rows)
+    atoms = []
+    for row in rows:
+        symbol, position = row.split(maxsplit=1)
+        atoms.append({"symbol": symbol, "position": [scale * x for x in _floats(position)]})
+    return atoms
+
+
+def _parse_projections(rows: list[str]) -> list[Projection]:
+    scale, rows = _split_units(rows)
+    projections = []
+    for row in rows:
+        projection = Projection.from_string("".join(row.split()))
+        if scale != 1.0 and projection.cartesian_site is not None:
+            projection = projection.model_copy(
+                update={"cartesian_site": [scale * x for x in projection.cartesian_site]}
+            )
+        projections.append(projection)
+    return projections
+
+
+def _parse_kpoints(rows: list[str]) -> list[list[str]]:
+    return [row.translate(_fortran_exponent).split()[:3] for row in rows]
+
+
+def _parse_nnkpts(rows: list[str]) -> list[dict[str, Any]]:
+    nnkpts = []
+    for row in rows:
+        kpoint, neighbor, *vector = row.split()
+        nnkpts.append(
+            {
+                "kpoint_number": kpoint,
+                "neighbor_kpoint_number": neighbor,
+                "reciprocal_lattice_vector": vector,
+            }
+        )
+    return nnkpts
+
+
+def _parse_kpoint_path(rows: list[str]) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+    path = []
+    for row in rows:
+        values = row.split()
+        path.append(
+            (
+                {"name": values[0], "coordinates": _to_float_list(" ".join(values[1:4]))},
+                {"name": values[4], "coordinates": _to_float_list(" ".join(values[5:8]))},
+            )
+        )
+    return path
+
+
+def _parse_dis_spheres(rows: list[str]) -> list[dict[str, Any]]:
+    spheres = []
+    for row in rows:
+        *center, radius = row.translate(_fortran_exponent).replace(",", " ").split()
+        spheres.append({"center": center, "radius": radius})
+    return spheres
+
+
+def _parse_slwf_centres(rows: list[str]) -> list[dict[str, Any]]:
+    centres = []
+    for row in rows:
+        number, *center = row.translate(_fortran_exponent).replace(",", " ").split()
+        centres.append({"number": number, "center": center[:3]})
+    return centres
+
+
+_block_parsers: dict[str, Callable[[list[str]], Any]] = {
+    "unit_cell_cart": _parse_unit_cell_cart,
+    "atoms_frac": _parse_atoms_frac,
+    "atoms_cart": _parse_atoms_cart,
+    "projections": _parse_projections,
+    "kpoints": _parse_kpoints,
+    "nnkpts": _parse_nnkpts,
+    "kpoint_path": _parse_kpoint_path,
+    "dis_spheres": _parse_dis_spheres,
+    "slwf_centres": _parse_slwf_centres,
+}
+
+block_keywords = frozenset(_block_parsers)
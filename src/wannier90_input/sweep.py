@@ -0,0 +1,75 @@
+"""Functions for generating the inputs of parameter sweeps (e.g. convergence studies)."""
+
+from collections.abc import Iterable, Iterator, Mapping
+from copy import deepcopy
+from itertools import product
+from typing import Any, Literal, TypeVar
+
+from wannier90_input.models.parameters import IndexRanges, array_fields
+from wannier90_input.models.template import Wannier90InputTemplate
+
+Model = TypeVar("Model", bound=Wannier90InputTemplate)
+
+
+def sweep(
+    base: Model,
+    grid: Mapping[str, Iterable[Any]],
+    mode: Literal["product", "zip"] = "product",
+) -> Iterator[Model]:
+    """Yield a variant of ``base`` for each combination of the values in ``grid``.
+
+    >>> for inp in sweep(base, {"num_iter": [100, 200], "dis_win_max": [10.0, 12.0]}):
+    ...     inp.write_to(...)  # doctest: +SKIP
+
+    Each value is validated once against the type of its field, before any variant is yielded;
+    the validators that relate several fields (e.g. that there are as many k-points as points in
+    ``mp_grid``) are then run on each variant, as by :meth:`~.Wannier90InputTemplate.update`.
+    The variants share the values of the fields that can hold arrays (e.g. ``kpoints``) as
+    read-only arrays, rather than copying them; the other lists are copied for each variant.
+
+    :param grid: the values of each field to sweep over
+    :param mode: ``"product"`` to yield every combination of the values (the last field varying
+        fastest), or ``"zip"`` to take the n-th value of every field for the n-th variant
+    :raises ValidationError: if a value is invalid, or a variant is
+    """
+    names = list(grid)
+    values = [
+        [_shareable(base, name, base.validate_field(name, value)) for value in grid[name]]
+        for name in names
+    ]
+    if mode == "product":
+        combinations: Iterable[tuple[Any, ...]] = product(*values)
+    elif mode == "zip":
+        if len({len(v) for v in values}) > 1:
+            raise ValueError("All of the fields must have the same number of values to zip them")
+        combinations = zip(*values, strict=True)
+    else:
+        raise ValueError(f"Unknown sweep mode `{mode}`")
+
+    unchanged = {
+        name: _shareable(base, name, value)
+        for name, value in base.__dict__.items()
+        if name not in grid
+    }
+    for combination in combinations:
+        *first, last = zip(names, map(_own, combination), strict=True)
+        variant = base.model_copy(update=dict(first))
+        variant.__dict__.update({name: _own(value) for name, value in unchanged.items()})
+        # Assigning the last value runs the validators of the model
+        variant.update(**dict([last]))
+        yield variant
+
+
+def _shareable(model: Wannier90InputTemplate, name: str, value: Any) -> Any:
+    """Return ``value`` as a read-only array if the field ``name`` can hold one."""
+    field = array_fields(type(model)).get(name)
+    if field is None or not isinstance(value, list) or not value:
+        return value
+    return field.validate_array(field.to_array(value))
+
+
+def _own(value: Any) -> Any:
+    """Return a copy of ``value`` that a variant can modify, unless it is immutable."""
+    if isinstance(value, list | dict | IndexRanges):
+        return deepcopy(value)
+    return value
@@ -1,5 +1,6 @@
 """Test configuration."""
 
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
@@ -9,3 +10,15 @@ import pytest
 def data_directory() -> Path:
     """Return the directory where we store data required for the test suite."""
     return Path(__file__).parent / "data"
+
+
+@pytest.fixture
+def write_win(data_directory: Path) -> Callable[[Path, int], Path]:
+    """Return a function that writes a copy of example.win with another num_wann to a path."""
+    example = (data_directory / "example.win").read_text()
+
+    def write(path: Path, num_wann: int) -> Path:
+        path.write_text(example.replace("num_wann  =  8", f"num_wann = {num_wann}"))
+        return path
+
+    return write
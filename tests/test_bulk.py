@@ -0,0 +1,65 @@
+"""Testing the `wannier90_input.bulk` module."""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import cast
+
+import pytest
+from pydantic import ValidationError
+
+from wannier90_input.bulk import TrustedConstructor, parse_many
+from wannier90_input.models.latest import Wannier90Input
+
+
+@pytest.fixture
+def win_files(tmp_path: Path, write_win: Callable[[Path, int], Path]) -> list[Path]:
+    """Return a list of .win files, some of which are invalid."""
+    paths = [write_win(tmp_path / f"{i}.win", i + 1) for i in range(6)]
+    paths[2].write_text("num_wann = not_a_number\n")
+    paths[4].write_text("begin kpoints\n")
+    return [*paths, tmp_path / "missing.win"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_many(win_files: list[Path], workers: int) -> None:
+    """Test that results are returned in order, with errors collected per file."""
+    results = parse_many(win_files, workers=workers, chunksize=2)
+
+    assert [result.path for result in results] == [str(path) for path in win_files]
+    assert [result.error is None for result in results] == [1, 1, 0, 1, 0, 1, 0]
+    models = [cast(Wannier90Input, result.model) for result in results if result.model]
+    assert [model.num_wann for model in models] == [1, 2, 4, 6]
+    assert results[4].error is not None
+    assert results[4].error.startswith("InvalidWinSyntaxError")
+
+
+def test_parse_many_without_models(win_files: list[Path]) -> None:
+    """Test that models can be dropped when only the errors are of interest."""
+    results = parse_many(win_files, workers=1, keep_models=False)
+    assert all(result.model is None for result in results)
+    assert sum(result.error is not None for result in results) == 3
+
+
+def test_trusted_constructor() -> None:
+    """Test that trusted values are constructed without validation, except for a sample."""
+    validated = Wannier90Input(
+        num_wann=2,
+        unit_cell_cart=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+        mp_grid=(1, 1, 1),
+        atoms_frac=[{"symbol": "H", "position": [0.0, 0.0, 0.0]}],
+    )
+    values = {name: getattr(validated, name) for name in validated.model_fields_set}
+    del values["num_bands"]
+
+    construct = TrustedConstructor(validate_every=3)
+    models = [construct(**values) for _ in range(7)]
+    assert all(model == validated for model in models)
+    assert str(models[1]) == str(validated)
+    assert (construct.constructed, construct.validated) == (7, 3)
+
+    invalid = values | {"num_iter": "many"}
+    assert construct(**invalid).num_iter == "many"  # type: ignore[attr-defined]
+    with pytest.raises(ValidationError):
+        TrustedConstructor(validate_every=1)(**invalid)
+    with pytest.raises(ValueError, match="required fields num_wann"):
+        construct(**{name: value for name, value in values.items() if name != "num_wann"})
@@ -0,0 +1,77 @@
+"""Testing the `wannier90_input.cache` module."""
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from wannier90_input.cache import ParsedInputCache
+
+
+@pytest.fixture
+def win_files(tmp_path: Path, write_win: Callable[[Path, int], Path]) -> list[Path]:
+    """Return a few .win files."""
+    return [write_win(tmp_path / f"{i}.win", i + 1) for i in range(3)]
+
+
+@pytest.mark.parametrize("identity", ["stat", "hash"])
+def test_hits_and_invalidation(win_files: list[Path], identity: str) -> None:
+    """Test that repeated reads hit the cache until the file changes."""
+    cache = ParsedInputCache(identity=identity)  # type: ignore[arg-type]
+
+    first = cache.get(win_files[0])
+    assert cache.get(win_files[0]) == first
+    assert cache.cache_info()[:2] == (1, 1)
+
+    win_files[0].write_text(win_files[0].read_text().replace("num_wann = 1", "num_wann = 7"))
+    stat = win_files[0].stat()
+    os.utime(win_files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert cache.get(win_files[0]).num_wann == 7  # type: ignore[attr-defined]
+    assert cache.cache_info()[:2] == (1, 2)
+
+
+def test_models_are_copies(win_files: list[Path]) -> None:
+    """Test that modifying a model returned by the cache does not modify the cached model."""
+    cache = ParsedInputCache()
+    first = cache.get(win_files[0])
+    first.num_wann = 99
+    second = cache.get(win_files[0])
+    assert second.num_wann == 1  # type: ignore[attr-defined]
+    second.exclude_bands.append(10)  # type: ignore[attr-defined]
+    assert list(cache.get(win_files[0]).exclude_bands) == [1, 2, 3, 7]  # type: ignore[attr-defined]
+
+
+def test_lru_eviction(win_files: list[Path]) -> None:
+    """Test that the least recently used entries are evicted beyond the size bound."""
+    cache = ParsedInputCache()
+    cache.get(win_files[0])
+    # (the entries of the files, which only differ in num_wann, are of the same size)
+    cache = ParsedInputCache(max_size=2 * cache.cache_info().size)
+    cache.get(win_files[0])
+    cache.get(win_files[1])
+    cache.get(win_files[0])
+    cache.get(win_files[2])
+
+    info = cache.cache_info()
+    assert (info.entries, info.evictions) == (2, 1)
+    cache.get(win_files[0])
+    assert cache.cache_info().hits == 2
+    cache.get(win_files[1])
+    assert cache.cache_info().misses == 4
+
+
+def test_save_and_load(win_files: list[Path], tmp_path: Path) -> None:
+    """Test persisting the cache between instances."""
+    cache = ParsedInputCache()
+    for path in win_files:
+        cache.get(path)
+    cache.save(tmp_path / "cache.pkl")
+
+    other = ParsedInputCache()
+    other.load(tmp_path / "cache.pkl")
+    assert other.get(win_files[1]) == cache.get(win_files[1])
+    assert other.cache_info()[:2] == (1, 0)
+
+    with pytest.raises(ValueError, match="incompatible"):
+        ParsedInputCache(identity="hash").load(tmp_path / "cache.pkl")
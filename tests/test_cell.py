@@ -0,0 +1,71 @@
+"""Testing the `wannier90_input.cell` module."""
+
+import numpy as np
+import pytest
+
+from wannier90_input.cell import cartesian_to_fractional, fractional_to_cartesian, to_angstrom
+from wannier90_input.models.latest import Wannier90Input
+from wannier90_input.models.parameters import Projection
+from wannier90_input.parse import BOHR_TO_ANG
+
+cell = np.array([[0.0, 2.7, 2.7], [2.7, 0.0, 2.7], [2.7, 2.7, 0.0]])
+
+
+def test_conversions() -> None:
+    """Test converting positions between cartesian and fractional coordinates."""
+    fractional = np.random.default_rng(0).random((1000, 3))
+    cartesian = fractional_to_cartesian(cell, fractional)
+    assert cartesian[1] == pytest.approx(fractional[1] @ cell)
+    assert cartesian_to_fractional(cell, cartesian) == pytest.approx(fractional)
+    assert cartesian_to_fractional(cell, cartesian + cell[0], wrap=True) == pytest.approx(
+        fractional
+    )
+    assert str(cartesian_to_fractional(cell, [0, 0, 0])) == "[[0. 0. 0.]]"
+    assert to_angstrom([1.0, 2.0], "bohr") == pytest.approx([BOHR_TO_ANG, 2 * BOHR_TO_ANG])
+    with pytest.raises(ValueError, match="Unknown length unit"):
+        to_angstrom([1.0], "nm")  # type: ignore[arg-type]
+
+
+def test_model_conversions() -> None:
+    """Test converting the atoms and projection sites of a model."""
+    inp = Wannier90Input.from_arrays(
+        cell,
+        ["Si", "Si"],
+        [[0, 0, 0], [0.25, 0.25, 0.25]],
+        num_wann=4,
+        mp_grid=[1, 1, 1],
+        projections=[
+            Projection.from_string("f=0.25,0.25,0.25:sp3"),
+            Projection.from_string("Si:s"),
+        ],
+    )
+    cartesian = inp.to_cartesian()
+    assert cartesian.atoms_frac is None
+    assert cartesian.atoms_cart is not None
+    assert cartesian.atoms_cart["position"][1] == pytest.approx([1.35, 1.35, 1.35])  # type: ignore[call-overload]
+    assert cartesian.projections[0].cartesian_site == pytest.approx([1.35, 1.35, 1.35])
+    assert cartesian.projections[1] == inp.projections[1]
+    assert inp.atoms_cart is None
+
+    fractional = cartesian.to_fractional()
+    assert fractional == inp
+    assert str(fractional) == str(inp)
+
+    shifted = Wannier90Input.from_arrays(
+        cell, ["Si"], [[6.75, 1.35, 4.05]], cartesian=True, num_wann=4, mp_grid=[1, 1, 1]
+    )
+    with pytest.raises(ValueError, match="outside the range"):
+        shifted.to_fractional()
+    wrapped = shifted.to_fractional(wrap=True).atoms_frac
+    assert wrapped is not None
+    assert wrapped["position"][0] == pytest.approx([0.75, 0.75, 0.75])  # type: ignore[call-overload]
+
+
+def test_units() -> None:
+    """Test that the unit cell and cartesian positions are converted from Bohr to Å."""
+    inp = Wannier90Input.from_arrays(
+        np.eye(3), ["H"], [[1, 0, 0]], cartesian=True, units="bohr", num_wann=1, mp_grid=[1, 1, 1]
+    )
+    assert inp.unit_cell_cart == pytest.approx(np.eye(3) * BOHR_TO_ANG)
+    assert inp.atoms_cart is not None
+    assert inp.atoms_cart["position"][0] == pytest.approx([BOHR_TO_ANG, 0, 0])  # type: ignore[call-overload]
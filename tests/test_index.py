@@ -0,0 +1,107 @@
+"""Testing the `wannier90_input.index` module."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from wannier90_input.index import WinIndex, index_directory, parse_condition
+from wannier90_input.parse import InvalidWinSyntaxError, peek
+
+
+@pytest.fixture
+def win_directory(tmp_path: Path, write_win: Callable[[Path, int], Path]) -> Path:
+    """Return a directory containing a few .win files."""
+    (tmp_path / "nested").mkdir()
+    write_win(tmp_path / "nested" / "small.win", 8)
+    large = write_win(tmp_path / "large.win", 60)
+    large.write_text(large.read_text().replace(".true.", "F") + "spinors = true\n")
+    return tmp_path
+
+
+def test_peek_skips_blocks(tmp_path: Path) -> None:
+    """Test that keywords inside blocks are ignored, and that only the first match is used."""
+    path = tmp_path / "test.win"
+    path.write_text("begin atoms_frac\nnum_wann 100\nend atoms_frac\nNUM_WANN = 4\nnum_wann 5\n")
+    assert peek(path, ["num_wann"]) == {"num_wann": "4"}
+
+
+@pytest.mark.parametrize("content", [b"= 5\nnum_wann = 4\n", b"! \xff\nnum_wann = 4\n"])
+def test_peek_invalid(tmp_path: Path, content: bytes) -> None:
+    """Test that lines which cannot be read are reported with their line number."""
+    path = tmp_path / "test.win"
+    path.write_bytes(content)
+    with pytest.raises(InvalidWinSyntaxError, match="Line 1: "):
+        peek(path, ["num_wann"])
+
+
+def test_parse_condition() -> None:
+    """Test parsing conditions, including the canonicalization of keywords."""
+    assert parse_condition("num_wann>50") == ("num_wann", ">", "50")
+    assert parse_condition(" SKIP_b1_TESTS = t ") == ("skip_B1_tests", "=", "t")
+    with pytest.raises(ValueError, match="not a Wannier90 keyword"):
+        parse_condition("not_a_keyword = 1")
+    with pytest.raises(ValueError, match="is a block"):
+        parse_condition("kpoints = 1")
+
+
+def test_index_query(win_directory: Path) -> None:
+    """Test building and querying an index."""
+    index = index_directory(win_directory, ["num_wann", "dis_froz_proj"])
+
+    assert index.query([("num_wann", ">", "50")]) == [str(win_directory / "large.win")]
+    assert index.query([parse_condition("dis_froz_proj = true")]) == [
+        str(win_directory / "nested" / "small.win")
+    ]
+    # Keywords that were not indexed are scanned for, and compared against their default value
+    # in the files that do not specify them
+    assert index.query([("spinors", "=", "false")]) == [str(win_directory / "nested" / "small.win")]
+    assert index.query([("spinors", "=", "true")]) == [str(win_directory / "large.win")]
+    index.close()
+
+
+def test_index_prunes_deleted_files(win_directory: Path) -> None:
+    """Test that files which no longer exist are removed from the index."""
+    index_directory(win_directory, ["num_wann"]).close()
+    (win_directory / "large.win").unlink()
+    index = index_directory(win_directory, ["num_wann"])
+    assert index.query([("num_wann", ">", "0")]) == [str(win_directory / "nested" / "small.win")]
+    assert index.values(win_directory / "large.win") == {}
+    index.close()
+
+
+def test_index_skips_invalid_files(win_directory: Path) -> None:
+    """Test that files which cannot be read are skipped (and reported), one at a time."""
+    (win_directory / "invalid.win").write_text("= 5\n")
+    (win_directory / "binary.win").write_bytes(b"num_wann = \xff\n")
+    index = index_directory(win_directory, ["num_wann"])
+    assert sorted(index.errors) == [
+        str(win_directory / "binary.win"),
+        str(win_directory / "invalid.win"),
+    ]
+    assert index.query([("num_wann", ">", "0")]) == [
+        str(win_directory / "large.win"),
+        str(win_directory / "nested" / "small.win"),
+    ]
+
+    # Once fixed, they are indexed
+    (win_directory / "invalid.win").write_text("num_wann = 5\n")
+    assert index.update([win_directory / "invalid.win"], ["num_wann"]) == 1
+    assert sorted(index.errors) == [str(win_directory / "binary.win")]
+    index.close()
+
+
+def test_index_is_incremental(win_directory: Path) -> None:
+    """Test that only new or modified files are re-scanned."""
+    index = WinIndex(win_directory / "index.sqlite")
+    paths = sorted(win_directory.rglob("*.win"))
+
+    assert index.update(paths, ["num_wann"]) == 2
+    assert index.update(paths, ["num_wann"]) == 0
+    assert index.update(paths, ["NUM_BANDS"]) == 2
+    assert index.values(paths[0]) == {"num_wann": 60, "num_bands": 12}
+
+    paths[0].write_text("num_wann = 1\n")
+    assert index.update(paths, ["num_wann"]) == 1
+    assert index.values(paths[0]) == {"num_wann": 1}
+    index.close()
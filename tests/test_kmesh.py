@@ -0,0 +1,123 @@
+"""Testing the `wannier90_input.kmesh` module."""
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from wannier90_input.kmesh import bvector_shells, monkhorst_pack, nnkpts
+from wannier90_input.models.latest import Wannier90Input
+
+
+def test_monkhorst_pack() -> None:
+    """Test the order, range and caching of Monkhorst-Pack meshes."""
+    mesh = monkhorst_pack((2, 3, 1))
+    assert mesh.tolist() == [[i / 2, j / 3, 0.0] for i in range(2) for j in range(3)]
+    assert monkhorst_pack((2, 3, 1)) is mesh
+    assert not mesh.flags.writeable
+
+
+def test_generated_kpoints() -> None:
+    """Test that kpoints="mp_grid" shares the cached mesh of mp_grid, and is written as a list."""
+    common = {
+        "num_wann": 1,
+        "unit_cell_cart": np.eye(3),
+        "mp_grid": [4, 4, 2],
+        "atoms_frac": [{"symbol": "H", "position": [0, 0, 0]}],
+    }
+    inp = Wannier90Input(**common, kpoints="mp_grid")
+    assert np.shares_memory(inp.kpoints, monkhorst_pack((4, 4, 2)))
+    expected = Wannier90Input(**common, kpoints=monkhorst_pack((4, 4, 2)).tolist())
+    assert inp == expected
+    assert str(inp) == str(expected)
+
+    with pytest.raises(ValidationError, match=r"There are 31 kpoints, but mp_grid = 4 4 2 has 32"):
+        Wannier90Input(**common, kpoints=monkhorst_pack((4, 4, 2))[:-1])
+    with pytest.raises(ValidationError, match="mp_grid"):
+        Wannier90Input(**common | {"mp_grid": "dense"}, kpoints="mp_grid")
+
+
+def test_generated_kpoints_on_assignment() -> None:
+    """Test that kpoints="mp_grid" generates the mesh when assigned, updated or batched too."""
+    inp = Wannier90Input(
+        num_wann=1,
+        unit_cell_cart=np.eye(3),
+        mp_grid=(2, 2, 2),
+        atoms_frac=[{"symbol": "H", "position": [0, 0, 0]}],
+    )
+    inp.kpoints = "mp_grid"  # type: ignore[assignment]
+    assert np.shares_memory(inp.kpoints, monkhorst_pack((2, 2, 2)))
+
+    # The mesh is that of the updated mp_grid, whichever order the values are given in
+    inp.update(kpoints="mp_grid", mp_grid=(3, 1, 1))
+    assert np.shares_memory(inp.kpoints, monkhorst_pack((3, 1, 1)))
+
+    with inp.batch():
+        inp.kpoints = "mp_grid"  # type: ignore[assignment]
+        inp.mp_grid = (1, 2, 1)
+    assert np.shares_memory(inp.kpoints, monkhorst_pack((1, 2, 1)))
+
+
+@pytest.mark.parametrize(
+    ("cell", "mp_grid", "num_vectors"),
+    [
+        (np.eye(3) * 4, (3, 3, 3), 6),
+        (np.array([[-1.0, 0.0, 1.0], [0.0, 1.0, 1.0], [-1.0, 1.0, 0.0]]) * 2.715, (4, 4, 4), 8),
+        (np.array([[2.46, 0, 0], [-1.23, 1.23 * np.sqrt(3), 0], [0, 0, 6.7]]), (6, 6, 2), 8),
+        (np.diag([3.0, 4.0, 10.0]), (8, 6, 2), 6),
+    ],
+)
+def test_bvector_shells(cell: np.ndarray, mp_grid: tuple[int, int, int], num_vectors: int) -> None:
+    """Test that the shells of b-vectors found for simple lattices satisfy B1."""
+    shells = bvector_shells(cell, mp_grid)
+    assert shells.b1_satisfied
+    assert len(shells.vectors) == num_vectors
+    b1 = np.einsum("m,mi,mj->ij", shells.weights, shells.vectors, shells.vectors)
+    assert b1 == pytest.approx(np.eye(3))
+    reciprocal = 2 * np.pi * np.linalg.inv(cell).T
+    assert shells.steps / np.array(mp_grid) @ reciprocal == pytest.approx(shells.vectors)
+    assert bvector_shells(cell, mp_grid) is shells
+
+
+def test_shell_list() -> None:
+    """Test that the shells in shell_list are used as they are, whether or not they satisfy B1."""
+    shells = bvector_shells(np.eye(3), (4, 4, 4), shell_list=[2])
+    assert shells.shells == (2,)
+    assert len(shells.vectors) == 12
+    assert shells.b1_satisfied
+
+    axial = bvector_shells(np.diag([1.0, 1.0, 4.0]), (4, 4, 4), shell_list=[1])
+    assert axial.steps.tolist() == [[0, 0, -1], [0, 0, 1]]
+    assert not axial.b1_satisfied
+
+
+def test_nnkpts() -> None:
+    """Test that the neighbours of each k-point are at k + b - G."""
+    mp_grid = (3, 4, 2)
+    shells = bvector_shells(np.diag([1.0, 1.5, 2.0]), mp_grid)
+    kpoints = np.random.default_rng(0).permutation(monkhorst_pack(mp_grid))
+    rows = nnkpts(shells, mp_grid, kpoints)
+    assert rows.shape == (len(kpoints) * len(shells.steps), 5)
+    steps = np.tile(shells.steps, (len(kpoints), 1))
+    k, neighbour, g = kpoints[rows[:, 0] - 1], kpoints[rows[:, 1] - 1], rows[:, 2:]
+    assert k + steps / mp_grid == pytest.approx(neighbour + g)
+
+    with pytest.raises(ValueError, match="not the points of mp_grid"):
+        nnkpts(shells, mp_grid, kpoints[1:])
+    with pytest.raises(ValueError, match="not the points of mp_grid"):
+        nnkpts(shells, mp_grid, kpoints + 0.1)
+
+
+def test_model_shells() -> None:
+    """Test checking B1 and filling nnkpts from a model."""
+    inp = Wannier90Input.from_arrays(
+        np.diag([1.0, 1.0, 4.0]), ["H"], [[0, 0, 0]], num_wann=1, mp_grid=[4, 4, 4]
+    )
+    inp.check_b1()
+    inp.fill_nnkpts()
+    assert inp.nnkpts.tolist() == nnkpts(inp.bvector_shells(), (4, 4, 4)).tolist()  # type: ignore[attr-defined]
+
+    inp.shell_list = [1]
+    with pytest.raises(ValueError, match=r"shells \[1\] do not satisfy the B1 condition"):
+        inp.check_b1()
+    inp.skip_B1_tests = True
+    inp.check_b1()
@@ -1,12 +1,26 @@
 """Test wannier90_input models."""
 
 import importlib
+import io
+import json
+import pickle
+from pathlib import Path
+from typing import Any
 
 import numpy as np
 import pytest
+from pydantic import ValidationError
 
 from wannier90_input.models import versions
-from wannier90_input.models.parameters import Projection, QuantumNumbers
+from wannier90_input.models.latest import Wannier90Input
+from wannier90_input.models.parameters import (
+    AtomCart,
+    AtomFrac,
+    IndexRanges,
+    Projection,
+    QuantumNumbers,
+    array_fields,
+)
 from wannier90_input.models.template import Wannier90InputTemplate
 
 
@@ -127,3 +141,470 @@ def test_projection_from_string(proj_str: str) -> None:
     """Test the creation of a Projections object from various valid strings."""
     proj = Projection.from_string(proj_str)
     assert isinstance(proj, Projection)
+
+
+def test_interned_projections() -> None:
+    """Test that parsing the same string again returns the same (frozen) object."""
+    info = Projection.cache_info()
+    proj = Projection.from_string("Fe:d")
+    assert Projection.from_string("Fe:d") is proj
+    assert Projection.cache_info().hits == info.hits + 1
+    assert Projection.from_string("O:d").ang_mtm is proj.ang_mtm
+    assert QuantumNumbers.from_string("d") is proj.ang_mtm
+    assert QuantumNumbers.cache_info().maxsize is not None
+    with pytest.raises(ValidationError):
+        proj.site = "O"  # type: ignore[misc]
+
+    # Nor can their lists be modified in place, although they are still lists
+    shared = Projection.from_string("f=0.5,0.5,0.5:l=1,mr=1,3")
+    assert shared == Projection(fractional_site=[0.5, 0.5, 0.5], ang_mtm="l=1,mr=1,3")
+    assert shared.model_dump()["fractional_site"] == [0.5, 0.5, 0.5]
+    assert pickle.loads(pickle.dumps(shared)) == shared  # noqa: S301
+    with pytest.raises(TypeError, match="read-only"):
+        shared.fractional_site[0] = 0.0  # type: ignore[index]
+    with pytest.raises(TypeError, match="read-only"):
+        shared.ang_mtm.m_r.append(2)  # type: ignore[union-attr]
+    assert (
+        str(Projection.from_string("f=0.5,0.5,0.5:l=1,mr=1,3"))
+        == "f=0.5,0.5,0.5:l=1,mr=1,3:0,0,1:1,0,0:1:1.0"
+    )
+    with pytest.raises(ValueError, match="Invalid angular momentum"):
+        Projection.from_string("Fe:q")
+
+
+@pytest.mark.parametrize("model", models())
+def test_numeric_blocks(model: type[Wannier90InputTemplate]) -> None:
+    """Test that numeric blocks are written exactly as their rows' string representations."""
+    rng = np.random.default_rng(42)
+    inp = model(  # type: ignore[call-arg]
+        num_wann=1,
+        unit_cell_cart=rng.random((3, 3)) * 1e-5,
+        mp_grid=[2, 1, 1],
+        atoms_frac=[
+            {"symbol": "Fe", "position": rng.random(3)},
+            {"symbol": "O", "position": [0] * 3},
+        ],
+        kpoints=[[0.0, 0.0, 0.0], [1 / 3, 0.1 + 0.2, 1e-7]],
+        nnkpts=[
+            {
+                "kpoint_number": 1,
+                "neighbor_kpoint_number": 2,
+                "reciprocal_lattice_vector": [0, -1, 1],
+            }
+        ],
+    )
+    text = str(inp)
+    for name in ["unit_cell_cart", "atoms_frac", "kpoints", "nnkpts"]:
+        value = getattr(inp, name)
+        rows = [
+            str(row).replace("[", "").replace("]", "").replace(",", "")
+            for row in (value.tolist() if isinstance(value, np.ndarray) else value)
+        ]
+        assert "\n ".join(rows) in text
+
+    assert " 0.33333333 0.30000000 0.00000010\n" in inp.to_str(precision=8)
+
+
+@pytest.mark.parametrize("model", models())
+def test_render_set_fields(model: type[Wannier90InputTemplate]) -> None:
+    """Test that rendering only writes set and modified fields, in the order of the model."""
+    inp = model(  # type: ignore[call-arg]
+        num_wann=4,
+        unit_cell_cart=np.eye(3),
+        mp_grid=[1, 1, 1],
+        atoms_frac=[{"symbol": "H", "position": [0, 0, 0]}],
+        num_iter=100,
+    )
+    inp.dis_num_iter = 50
+    inp.exclude_bands.append(5)  # type: ignore[attr-defined]
+    keywords = [line.split()[0] for line in str(inp).splitlines() if "=" in line]
+    assert keywords == ["num_wann", "num_bands", "mp_grid", "exclude_bands", "dis_num_iter"]
+
+
+def test_write_to(tmp_path: Path) -> None:
+    """Test that streaming a model to a file writes exactly its string representation."""
+    inp = Wannier90Input(
+        num_wann=1,
+        unit_cell_cart=np.eye(3),
+        mp_grid=[100, 100, 1],
+        atoms_frac=[{"symbol": "H", "position": [0, 0, 0]}],
+        kpoints=np.random.default_rng(0).random((10000, 3)),
+    )
+    path = tmp_path / "large.win"
+    inp.write_to(path)
+    assert path.read_bytes() == str(inp).encode()
+
+    f = io.StringIO()
+    inp.write_to(f, precision=6)
+    assert f.getvalue() == inp.to_str(precision=6)
+    assert max(line.count("\n") for line in inp.iter_lines()) < 10000
+
+
+def test_render_cache() -> None:
+    """Test that rendered blocks are reused until their field is assigned."""
+    inp = Wannier90Input(
+        num_wann=1,
+        unit_cell_cart=np.eye(3),
+        mp_grid=[1, 1, 1],
+        atoms_frac=[{"symbol": "H", "position": [0, 0, 0]}],
+        kpoints=[[0, 0, 0]],
+    )
+    str(inp)
+    assert ("kpoints", None) in inp._render_cache
+    assert inp == Wannier90Input.model_validate(inp.model_dump())
+    assert not pickle.loads(pickle.dumps(inp))._render_cache  # noqa: S301
+
+    inp.num_iter = 50
+    assert ("kpoints", None) in inp._render_cache
+    # Each copy (e.g. each variant of a sweep) has its own cache
+    copy = inp.model_copy(update={"kpoints": [[0.5, 0.5, 0.5]]})
+    assert not copy._render_cache
+    assert " 0.5 0.5 0.5" in str(copy)
+    assert ("kpoints", None) in copy._render_cache
+    assert inp._render_cache["kpoints", None][0] is inp.kpoints
+    assert str(inp) == str(inp.model_copy(deep=True))
+    assert "num_iter = 50" in str(inp)
+
+    inp.kpoints = [[0.5, 0, 0]]
+    assert ("kpoints", None) not in inp._render_cache
+    assert " 0.5 0.0 0.0" in str(inp)
+
+    inp.kpoints.append([0.25, 0.0, 0.0])
+    assert " 0.25 0.0 0.0" in str(inp)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        {},
+        {"num_iter": 500, "dis_win_max": 12.5},
+        {"num_iter": 100, "conv_tol": "1e-8"},
+        {"num_wann": 2, "kpoints": []},
+        {"kpoints": [[0.5, 0.5, 0.5]], "dis_win_max": None},
+    ],
+)
+def test_compile(values: dict[str, Any]) -> None:
+    """Test that filling the slots of a compiled model gives the same text as updating it."""
+    inp = Wannier90Input(
+        num_wann=4,
+        unit_cell_cart=np.eye(3),
+        mp_grid=[1, 1, 1],
+        atoms_frac=[{"symbol": "H", "position": [0, 0, 0]}],
+        kpoints=[[0.0, 0.0, 0.0]],
+        dis_win_max=10.0,
+    )
+    template = inp.compile("num_wann", "kpoints", "num_iter", "dis_win_max", "conv_tol")
+    update = {name: inp.validate_field(name, value) for name, value in values.items()}
+    assert template.render(**values) == str(inp.model_copy(update=update))
+
+    with pytest.raises(ValidationError):
+        template.render(num_iter="many")
+
+
+def test_update() -> None:
+    """Test updating several fields at once, with a single validation of the model."""
+    inp = Wannier90Input(
+        num_wann=4,
+        unit_cell_cart=np.eye(3),
+        mp_grid=[1, 1, 1],
+        atoms_cart=[{"symbol": "H", "position": [0, 0, 0]}],
+    )
+    atoms_frac = [{"symbol": "H", "position": [0.5, 0, 0]}]
+    with pytest.raises(ValidationError, match="not both"):
+        inp.atoms_frac = atoms_frac  # type: ignore[assignment]
+    inp.update(atoms_frac=atoms_frac, atoms_cart=None, num_iter="50")
+    assert inp.atoms_cart is None
+    assert inp.atoms_frac is not None and inp.atoms_frac[0].position == [0.5, 0.0, 0.0]
+    assert inp.num_iter == 50
+    assert "num_iter = 50" in str(inp)
+
+    before = inp.model_copy(deep=True)
+    with pytest.raises(ValidationError, match="atoms_frac or atoms_cart"):
+        inp.update(num_iter=10, atoms_frac=None)
+    with pytest.raises(ValidationError):
+        inp.update(num_iter="many", dis_win_max=1.0)
+    assert inp == before
+
+    with inp.batch():
+        inp.atoms_frac = None
+        inp.atoms_cart = [{"symbol": "He", "position": [0, 0, 0]}]  # type: ignore[list-item]
+        inp.dis_win_max = "2"  # type: ignore[assignment]
+    assert inp.atoms_cart is not None and inp.atoms_cart[0].symbol == "He"
+    assert inp.dis_win_max == 2.0
+
+    before = inp.model_copy(deep=True)
+    with pytest.raises(ValidationError), inp.batch():
+        inp.num_iter = 5
+        inp.atoms_cart = None
+    assert inp == before
+    assert inp.model_fields_set == before.model_fields_set
+
+    # A copy made within a batch is assigned to (and validated) on its own
+    with inp.batch():
+        copy = inp.model_copy()
+        copy.num_iter = 7
+    assert inp.num_iter == before.num_iter
+    assert copy.num_iter == 7
+
+
+def test_validate_many() -> None:
+    """Test validating a batch of inputs, with the errors reported per item."""
+    valid = {
+        "num_wann": 1,
+        "unit_cell_cart": [[1, 0, 0], [0, 1, 0], [0, 0, 1]],
+        "mp_grid": [1, 1, 1],
+        "atoms_frac": [{"symbol": "H", "position": [0, 0, 0]}],
+    }
+    expected = Wannier90Input.model_validate(valid)
+    items = [valid, valid | {"num_iter": "many"}, {}, 3, valid | {"num_iter": "50"}]
+    results = Wannier90Input.validate_many(items)
+    assert [result.model for result in results] == [
+        expected,
+        None,
+        None,
+        None,
+        Wannier90Input.model_validate(valid | {"num_iter": 50}),
+    ]
+
+    assert results[1].error is not None
+    assert [error["loc"] for error in results[1].error.errors()] == [("num_iter",)]
+    assert results[2].error is not None and results[2].error.error_count() == 3
+    assert results[3].error is not None and results[3].error.errors()[0]["type"] == "model_type"
+
+    results_json = Wannier90Input.validate_many(json.dumps(items).encode())
+    assert [(result.model, result.error is None) for result in results_json] == [
+        (result.model, result.error is None) for result in results
+    ]
+    assert all(
+        result.model == expected for result in Wannier90Input.validate_many(json.dumps([valid] * 3))
+    )
+    with pytest.raises(ValidationError):
+        Wannier90Input.validate_many(b"{}")
+
+
+def test_array_blocks() -> None:
+    """Test that kpoints and nnkpts can be stored as (read-only views of) arrays, as if lists."""
+    rng = np.random.default_rng(0)
+    kpoints = rng.random((5, 3))
+    nnkpts = np.array([[1, 2, 0, 0, 1], [2, 1, -1, 0, 0]], dtype=np.int32)
+    common = {
+        "num_wann": 1,
+        "unit_cell_cart": np.eye(3),
+        "mp_grid": [5, 1, 1],
+        "atoms_frac": [{"symbol": "H", "position": [0, 0, 0]}],
+    }
+    arrays = Wannier90Input(**common, kpoints=kpoints, nnkpts=nnkpts)
+    lists = Wannier90Input(
+        **common,
+        kpoints=kpoints.tolist(),
+        nnkpts=[
+            {"kpoint_number": k, "neighbor_kpoint_number": n, "reciprocal_lattice_vector": g}
+            for k, n, *g in nnkpts.tolist()
+        ],
+    )
+    for stored, array in [(arrays.kpoints, kpoints), (arrays.nnkpts, nnkpts)]:
+        assert isinstance(stored, np.ndarray)
+        assert np.shares_memory(stored, array)
+        assert not stored.flags.writeable
+    assert arrays == lists
+    assert str(arrays) == str(lists)
+    assert arrays.model_dump() == lists.model_dump()
+    assert arrays.model_dump_json() == lists.model_dump_json()
+
+    arrays.kpoints = kpoints[::-1].astype(np.float32)  # type: ignore[assignment]
+    assert arrays.kpoints.dtype == np.float64  # type: ignore[attr-defined]
+    assert arrays != lists
+
+    with pytest.raises(ValidationError, match=r"Row 1 .* outside the range \[0.0, 1.0\]"):
+        arrays.kpoints = np.array([[0, 0, 0], [0, 0, 1.5]])  # type: ignore[assignment]
+    with pytest.raises(ValidationError, match=r"shape \(n, 5\)"):
+        arrays.nnkpts = nnkpts[:, :3]  # type: ignore[assignment]
+
+
+def test_array_cell_and_positions() -> None:
+    """Test that the unit cell and the positions of atoms can be given as arrays."""
+    cell = np.diag([1.0, 2.0, 3.0])
+    position = np.array([0.25, 0.5, 0.75])
+    inp = Wannier90Input(
+        num_wann=1,
+        unit_cell_cart=cell,
+        mp_grid=[1, 1, 1],
+        atoms_frac=[AtomFrac(symbol="H", position=position)],
+    )
+    assert np.shares_memory(inp.unit_cell_cart, cell)
+    assert inp.atoms_frac is not None
+    assert np.shares_memory(inp.atoms_frac[0].position, position)
+    expected = Wannier90Input.model_validate(inp.model_dump())
+    assert isinstance(expected.unit_cell_cart, list)
+    assert inp == expected
+    assert str(inp) == str(expected)
+
+    with pytest.raises(ValidationError, match=r"shape \(3, 3\)"):
+        inp.unit_cell_cart = np.eye(2)  # type: ignore[assignment]
+    with pytest.raises(ValidationError, match=r"\(1.5 0.0 0.0\) has elements outside"):
+        AtomFrac(symbol="H", position=np.array([1.5, 0, 0]))
+    atom = AtomCart(symbol="H", position=np.arange(3))
+    assert atom.position.dtype == np.float64  # type: ignore[attr-defined]
+
+
+def test_array_files(tmp_path: Path) -> None:
+    """Test that kpoints and nnkpts can be memory-mapped from .npy files."""
+    kpoints = np.random.default_rng(0).random((100_000, 3))
+    nnkpts = np.array([[1, 2, 0, 0, 1], [2, 1, -1, 0, 0]])
+    np.save(tmp_path / "kpoints.npy", kpoints)
+    np.save(tmp_path / "nnkpts.npy", nnkpts)
+    common = {
+        "num_wann": 1,
+        "unit_cell_cart": np.eye(3),
+        "mp_grid": [100, 100, 10],
+        "atoms_frac": [{"symbol": "H", "position": [0, 0, 0]}],
+    }
+    mapped = Wannier90Input(
+        **common, kpoints=tmp_path / "kpoints.npy", nnkpts=str(tmp_path / "nnkpts.npy")
+    )
+    assert isinstance(mapped.kpoints, np.memmap)
+    assert isinstance(mapped.nnkpts, np.memmap)
+    assert mapped.nnkpts.dtype == np.int64
+    in_memory = Wannier90Input(**common, kpoints=kpoints, nnkpts=nnkpts)
+    assert mapped == in_memory
+    mapped.write_to(tmp_path / "mapped.win")
+    assert (tmp_path / "mapped.win").read_text() == str(in_memory) == str(mapped)
+    # (the text of the mapped blocks is not kept, unlike that of the blocks in memory)
+    assert ("kpoints", None) in in_memory._render_cache
+    assert ("kpoints", None) not in mapped._render_cache
+
+    kpoints[70_000, 2] = 1.5
+    np.save(tmp_path / "kpoints.npy", kpoints)
+    with pytest.raises(ValidationError, match=r"Row 70000 .* outside the range"):
+        mapped.kpoints = tmp_path / "kpoints.npy"
+    np.savez(tmp_path / "kpoints.npz", kpoints=kpoints)
+    for path in ["kpoints.npz", "missing.npy"]:
+        with pytest.raises(ValidationError, match="kpoints"):
+            mapped.kpoints = tmp_path / path
+
+
+def test_from_arrays(tmp_path: Path) -> None:
+    """Test creating a model whose atoms are stored as one structured array."""
+    rng = np.random.default_rng(0)
+    symbols = ["Fe", "O"] * 50
+    positions = rng.random((100, 3))
+    inp = Wannier90Input.from_arrays(np.eye(3), symbols, positions, num_wann=1, mp_grid=[1, 1, 1])
+    assert isinstance(inp.atoms_frac, np.ndarray)
+    assert inp.atoms_frac.dtype.names == ("symbol", "position")
+    expected = Wannier90Input(
+        num_wann=1,
+        unit_cell_cart=np.eye(3),
+        mp_grid=[1, 1, 1],
+        atoms_frac=[
+            {"symbol": s, "position": p} for s, p in zip(symbols, positions.tolist(), strict=True)
+        ],
+    )
+    assert inp == expected
+    assert str(inp) == str(expected)
+    assert inp.model_dump() == expected.model_dump()
+
+    np.save(tmp_path / "atoms.npy", inp.atoms_frac)
+    mapped = expected.model_copy()
+    mapped.atoms_frac = tmp_path / "atoms.npy"
+    assert isinstance(mapped.atoms_frac, np.memmap)
+    assert str(mapped) == str(expected)
+
+    cart = Wannier90Input.from_arrays(
+        np.eye(3), ["H"], [[1, 2, 3]], cartesian=True, num_wann=1, mp_grid=[1, 1, 1]
+    )
+    assert cart.atoms_frac is None
+    assert "begin atoms_cart\n H 1.0 2.0 3.0\nend atoms_cart" in str(cart)
+    with pytest.raises(ValidationError, match=r"Row 1 .* outside the range"):
+        Wannier90Input.from_arrays(np.eye(3), ["H", "H"], [[0, 0, 0], [2, 0, 0]], num_wann=1)
+    with pytest.raises(ValueError, match="same length"):
+        Wannier90Input.from_arrays(np.eye(3), ["H", "H"], [[0, 0, 0]], num_wann=1)
+    with pytest.raises(ValidationError, match="fields"):
+        inp.atoms_frac = np.zeros(2)
+
+
+def test_index_ranges() -> None:
+    """Test sets of indices written as ranges, e.g. for exclude_bands."""
+    bands = IndexRanges.from_string("41-45, 1-40 50")
+    assert bands.ranges == ((1, 45), (50, 50))
+    assert str(bands) == "1-45,50"
+    assert len(bands) == 46
+    assert 45 in bands and 46 not in bands
+    assert bands == [*range(1, 46), 50]
+    assert IndexRanges([50, *range(45, 0, -1)]) == bands
+    bands.append(46)
+    assert str(bands) == "1-46,50"
+    with pytest.raises(ValueError, match="Invalid range"):
+        IndexRanges.from_string("1-x")
+
+    inp = Wannier90Input(
+        num_wann=1,
+        unit_cell_cart=np.eye(3),
+        mp_grid=[1, 1, 1],
+        atoms_frac=[{"symbol": "H", "position": [0, 0, 0]}],
+        exclude_bands=list(range(1, 401)),
+        select_projections="1-3",
+    )
+    assert inp.exclude_bands.ranges == ((1, 400),)
+    assert str(inp).endswith("exclude_bands = 1-400\nselect_projections = 1-3")
+    assert inp.model_dump()["select_projections"] == [1, 2, 3]
+    assert Wannier90Input.model_validate_json(inp.model_dump_json()) == inp
+    assert Wannier90Input.from_str(str(inp)) == inp
+    with pytest.raises(ValidationError, match="positive"):
+        inp.exclude_bands = [0, 1]  # type: ignore[assignment]
+
+
+def test_kpoints_validation() -> None:
+    """Test that lists of k-points are validated at once, naming the rows that are invalid."""
+    kpoints = np.random.default_rng(0).random((1000, 3)).tolist()
+    validated = Wannier90Input.validate_field("kpoints", kpoints)
+    assert validated == kpoints
+
+    # The validated rows are a copy, which changing the given list afterwards doesn't affect
+    assert validated is not kpoints and validated[1] is not kpoints[1]
+    kpoints[1][0], original = 0.5, kpoints[1][0]
+    assert validated[1][0] == original
+
+    # Whether the numbers are written as floats or not, a list is stored
+    assert Wannier90Input.validate_field("kpoints", [[0, 0, 0]]) == [[0.0, 0.0, 0.0]]
+
+    for invalid in [1.5, -0.1, float("nan")]:
+        kpoints[500][1] = invalid
+        with pytest.raises(ValidationError, match=r"Row 500 .* outside the range"):
+            Wannier90Input.validate_field("kpoints", kpoints)
+        with pytest.raises(ValidationError, match=r"Row 500 .* outside the range"):
+            Wannier90Input.validate_field("kpoints", np.array(kpoints))
+
+    # Anything but a list of rows of floats is validated (and converted) item by item
+    kpoints[500] = [0, 1, "0.5"]
+    validated = Wannier90Input.validate_field("kpoints", kpoints)
+    assert validated is not kpoints
+    assert validated[500] == [0.0, 1.0, 0.5]
+    kpoints[500] = [0.0, 0.0]
+    with pytest.raises(ValidationError, match="500"):
+        Wannier90Input.validate_field("kpoints", kpoints)
+
+
+def test_spheres_and_centres() -> None:
+    """Test giving dis_spheres and slwf_centres as structured arrays, and writing them."""
+    fields = array_fields(Wannier90Input)
+    centers = np.random.default_rng(0).random((100, 3))
+    spheres = fields["dis_spheres"].from_columns(centers, np.full(100, 2.5))
+    centres = fields["slwf_centres"].from_columns(np.arange(1, 101), centers)
+    inp = Wannier90Input(
+        num_wann=100,
+        unit_cell_cart=np.eye(3),
+        mp_grid=[1, 1, 1],
+        atoms_frac=[{"symbol": "H", "position": [0, 0, 0]}],
+        dis_spheres=spheres,
+        slwf_centres=centres,
+    )
+    assert isinstance(inp.dis_spheres, np.ndarray)
+    assert inp.model_dump()["slwf_centres"][1] == {"number": 2, "center": centers[1].tolist()}
+    assert f"\n {' '.join(map(str, centers[1]))} 2.5\n" in str(inp)
+    assert f"\n 2 {' '.join(map(str, centers[1]))}\n" in str(inp)
+    assert Wannier90Input.from_str(str(inp)) == inp
+
+    # Only the centres are within [0, 1]
+    spheres["center"][7, 1] = 1.5
+    with pytest.raises(ValidationError, match=r"Row 7 .* outside the range"):
+        inp.dis_spheres = spheres
@@ -0,0 +1,121 @@
+"""Testing the `wannier90_input.parse` module."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from wannier90_input.models.latest import Wannier90Input
+from wannier90_input.parse import (
+    BOHR_TO_ANG,
+    InvalidWinSyntaxError,
+    UnknownKeywordError,
+    tokenize,
+)
+
+
+@pytest.fixture
+def example_win(data_directory: Path) -> Path:
+    """Return the filepath of an example .win file."""
+    return data_directory / "example.win"
+
+
+def test_from_file(example_win: Path) -> None:
+    """Test reading a .win file from its path."""
+    inp = Wannier90Input.from_file(example_win)
+
+    assert inp.num_wann == 8
+    assert inp.num_bands == 12
+    assert inp.dis_froz_proj is True
+    assert inp.skip_B1_tests is True
+    assert inp.kmesh_tol == 1e-5
+    assert inp.exclude_bands == [1, 2, 3, 7]
+    assert inp.mp_grid == (2, 2, 2)
+    assert inp.unit_cell_cart[0] == pytest.approx([-5.10 * BOHR_TO_ANG, 0.0, 5.10 * BOHR_TO_ANG])
+    assert inp.atoms_frac is not None
+    assert [atom.symbol for atom in inp.atoms_frac] == ["Si", "Si"]
+    assert len(inp.kpoints) == 8
+    assert str(inp.projections[0].ang_mtm) == "l=-3"
+
+
+def test_from_file_object(example_win: Path) -> None:
+    """Test that reading from a path and from a file object give the same model."""
+    with open(example_win) as f:
+        assert Wannier90Input.from_file(f) == Wannier90Input.from_file(example_win)
+
+
+def test_round_trip(example_win: Path) -> None:
+    """Test that the string representation of a parsed model can be parsed again."""
+    inp = Wannier90Input.from_file(example_win)
+    assert Wannier90Input.from_str(str(inp)) == inp
+
+
+def test_tokenize() -> None:
+    """Test the tokenization of keywords and blocks."""
+    lines = io.StringIO("A = 1\nb: 2 # comment\nc 3\n\nBEGIN blk\n x y\nEND blk\n")
+    assert list(tokenize(lines)) == [("a", "1"), ("b", "2"), ("c", "3"), ("blk", ["x y"])]
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["begin kpoints\n0 0 0\n", "begin kpoints\nend atoms_frac\n", "begin a\nbegin b\nend b\n"],
+)
+def test_invalid_blocks(content: str) -> None:
+    """Test that unbalanced blocks are reported."""
+    with pytest.raises(InvalidWinSyntaxError):
+        list(tokenize(content.splitlines()))
+
+
+@pytest.mark.parametrize("line", ["= 4", ": x"])
+def test_missing_keyword(line: str) -> None:
+    """Test that a keyword line without a keyword is reported with its line number."""
+    with pytest.raises(InvalidWinSyntaxError, match="Line 2: "):
+        list(tokenize(["num_wann = 4", line]))
+
+
+def test_duplicate_keyword(example_win: Path) -> None:
+    """Test that a keyword cannot be specified twice."""
+    with pytest.raises(InvalidWinSyntaxError):
+        Wannier90Input.from_str(example_win.read_text() + "\nnum_wann = 8\n")
+
+
+def test_keyword_table() -> None:
+    """Test that the generated keyword table covers every field and the postw90 keywords."""
+    table = Wannier90Input.keyword_table
+    assert set(Wannier90Input.model_fields) <= set(table.values())
+    assert table["skip_b1_tests"] == "skip_B1_tests"
+    assert "berry_task" in Wannier90Input.postw90_keywords
+    assert set(Wannier90Input.postw90_keywords).isdisjoint(Wannier90Input.model_fields)
+
+
+def test_unknown_keyword(example_win: Path) -> None:
+    """Test that unknown keywords are reported with a suggestion."""
+    with pytest.raises(UnknownKeywordError, match="did you mean `skip_B1_tests`"):
+        Wannier90Input.from_str(example_win.read_text() + "\nskip_b1_test = true\n")
+
+
+def test_postw90_keywords(example_win: Path) -> None:
+    """Test that keywords only used by postw90 are dropped with a warning."""
+    content = example_win.read_text() + "\nBerry = true\nberry_task = ahc\n"
+    with pytest.warns(UserWarning, match="berry, berry_task"):
+        inp = Wannier90Input.from_str(content)
+    assert inp == Wannier90Input.from_file(example_win)
+
+
+def test_lazy_open(example_win: Path) -> None:
+    """Test that blocks of a lazily-opened file are only parsed once they are accessed."""
+    with Wannier90Input.open(example_win) as win:
+        assert set(win.block_ranges) == {"unit_cell_cart", "atoms_frac", "projections", "kpoints"}
+        assert win["num_wann"] == 8
+        assert win["mp_grid"] == (2, 2, 2)
+        assert "kpoints" not in win._values
+        assert len(win["kpoints"]) == 8
+        assert win.to_model() == Wannier90Input.from_file(example_win)
+
+
+def test_lazy_open_invalid(tmp_path: Path) -> None:
+    """Test that unbalanced blocks are reported when opening a file lazily."""
+    path = tmp_path / "invalid.win"
+    path.write_text("num_wann = 1\nbegin kpoints\n0 0 0\n")
+    with pytest.raises(InvalidWinSyntaxError):
+        Wannier90Input.open(path)
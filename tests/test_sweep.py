@@ -0,0 +1,82 @@
+"""Testing the `wannier90_input.sweep` module."""
+
+from typing import Any
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from wannier90_input.models.latest import Wannier90Input
+from wannier90_input.sweep import sweep
+
+
+@pytest.fixture
+def base() -> Wannier90Input:
+    """Return a model to sweep over."""
+    return Wannier90Input(
+        num_wann=4,
+        unit_cell_cart=np.eye(3),
+        mp_grid=[2, 2, 2],
+        atoms_frac=[{"symbol": "H", "position": [0, 0, 0]}],
+        kpoints=np.random.default_rng(0).random((8, 3)),
+    )
+
+
+def test_sweep_product(base: Wannier90Input) -> None:
+    """Test that every combination is yielded, sharing the fields that are not swept."""
+    variants = list(sweep(base, {"num_iter": [100, 200, 300], "dis_win_max": ["10", 12]}))
+    assert [(v.num_iter, v.dis_win_max) for v in variants] == [
+        (n, w) for n in [100, 200, 300] for w in [10.0, 12.0]
+    ]
+    for variant in variants:
+        assert variant.kpoints is base.kpoints
+        # (lists that can be arrays are shared as read-only arrays, the others are copied)
+        assert isinstance(variant.atoms_frac, np.ndarray)
+        assert variant.atoms_frac is variants[0].atoms_frac
+        assert not variant.atoms_frac.flags.writeable
+        assert variant.exclude_bands == base.exclude_bands
+        assert variant.exclude_bands is not base.exclude_bands
+        expected = base.model_dump() | {
+            "num_iter": variant.num_iter,
+            "dis_win_max": variant.dis_win_max,
+        }
+        assert str(variant) == str(Wannier90Input.model_validate(expected))
+    assert variants[0].dis_win_max is variants[2].dis_win_max
+    assert base.num_iter == 100 and base.dis_win_max is None
+
+
+def test_sweep_zip(base: Wannier90Input) -> None:
+    """Test zipping the values of several fields."""
+    grid: dict[str, list[Any]] = {
+        "mp_grid": [(1, 1, 1), (2, 1, 1)],
+        "kpoints": [[[0, 0, 0]], [[0, 0, 0], [0.5, 0, 0]]],
+    }
+    variants = sweep(base, grid, "zip")
+    assert [(v.mp_grid, v.kpoints.tolist()) for v in variants] == [  # type: ignore[attr-defined]
+        ((1, 1, 1), [[0.0, 0.0, 0.0]]),
+        ((2, 1, 1), [[0.0, 0.0, 0.0], [0.5, 0.0, 0.0]]),
+    ]
+    with pytest.raises(ValueError, match="same number of values"):
+        next(sweep(base, {"num_iter": [100, 200], "dis_win_max": [1.0]}, "zip"))
+
+
+def test_sweep_invalid(base: Wannier90Input) -> None:
+    """Test that invalid values are reported before any variant is yielded, and invalid variants."""
+    with pytest.raises(ValidationError):
+        next(sweep(base, {"num_iter": [100, "many"]}))
+    with pytest.raises(ValidationError, match="There are 8 kpoints"):
+        next(sweep(base, {"mp_grid": [(1, 1, 1)]}))
+    with pytest.raises(ValidationError, match="not both"):
+        next(sweep(base, {"atoms_cart": [[{"symbol": "H", "position": [0, 0, 0]}]]}))
+
+
+def test_sweep_copies(base: Wannier90Input) -> None:
+    """Test that modifying a variant in place changes neither the base nor the other variants."""
+    base.shell_list = [1, 2]
+    first, second = sweep(base, {"num_iter": [100, 200]})
+    first.shell_list.append(3)
+    first.exclude_bands.add(5)
+    assert second.shell_list == base.shell_list == [1, 2]
+    assert not second.exclude_bands and not base.exclude_bands
+    with pytest.raises(ValueError, match="read-only"):
+        first.atoms_frac[0] = second.atoms_frac[0]  # type: ignore[index]